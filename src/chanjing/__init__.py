@@ -6,11 +6,15 @@
 
     client = CicadaClient(app_id="xxx", secret_key="yyy")
     result = client.lip_sync(video="video.mp4", audio="audio.wav")
+
+异步版本（需安装 chanjingsdk[http2]）:
+    from chanjing import AsyncCicadaClient
 """
 
+from .async_client import AsyncCicadaClient
 from .client import CicadaClient
 from .services.lip_sync import LipSyncResult
 from .services.tts import TTSResult
 
 __version__ = "1.0.0"
-__all__ = ["CicadaClient", "LipSyncResult", "TTSResult", "__version__"]
+__all__ = ["AsyncCicadaClient", "CicadaClient", "LipSyncResult", "TTSResult", "__version__"]
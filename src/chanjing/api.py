@@ -1,17 +1,31 @@
 """
 HTTP 请求封装：带重试、频率控制、文件上传。
+
+默认基于 requests；安装 httpx[http2] 后可选用 transport="httpx"，
+通过单条 HTTP/2 连接多路复用并发请求。
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import re
+import shutil
+import threading
 import time
-from typing import TYPE_CHECKING, Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .utils import HashingFileWrapper, format_file_size, json_dumps_bytes, json_loads
 
-from .utils import format_file_size
+try:
+    import httpx
+    _HTTPX_AVAILABLE = True
+except ImportError:
+    _HTTPX_AVAILABLE = False
 
 if TYPE_CHECKING:
     from .auth import AuthManager
@@ -19,6 +33,41 @@ if TYPE_CHECKING:
 logger = logging.getLogger("chanjing")
 
 BASE_URL = "https://open-api.chanjing.cc"
+USER_AGENT = "chanjingsdk-python"
+TRANSPORTS = ("requests", "httpx")
+
+ACCESS_TOKEN_ENDPOINT = f"{BASE_URL}/open/v1/access_token"
+UPLOAD_URL_ENDPOINT = f"{BASE_URL}/open/v1/common/create_upload_url"
+FILE_DETAIL_ENDPOINT = f"{BASE_URL}/open/v1/common/file_detail"
+
+# 结果文件下载共用的连接池：重复下载同一 CDN 域名时复用 keep-alive 连接。
+# 下载是幂等的 GET，连接失败和网关错误由连接池层退避重试；
+# 重试用尽后返回最后一次响应，由 raise_for_status 报错
+_DOWNLOAD_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        raise_on_status=False,
+    ),
+)
+DOWNLOAD_SESSION = requests.Session()
+DOWNLOAD_SESSION.headers["User-Agent"] = USER_AGENT
+DOWNLOAD_SESSION.mount("https://", _DOWNLOAD_ADAPTER)
+DOWNLOAD_SESSION.mount("http://", _DOWNLOAD_ADAPTER)
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# 可重试的网络异常；HTTP 状态码错误等其余异常直接向上抛出
+_TIMEOUT_ERRORS: tuple[type[Exception], ...] = (requests.exceptions.Timeout,)
+_RETRYABLE_ERRORS: tuple[type[Exception], ...] = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+if _HTTPX_AVAILABLE:
+    _TIMEOUT_ERRORS += (httpx.TimeoutException,)
+    _RETRYABLE_ERRORS += (httpx.NetworkError, httpx.TimeoutException)
 
 
 # ────────────────────────── 频率控制 ──────────────────────────
@@ -26,75 +75,109 @@ BASE_URL = "https://open-api.chanjing.cc"
 class RateLimiter:
     """
     按接口类别分别控制请求频率。
-    实例级别（非全局），每个 ApiClient 拥有独立的 RateLimiter。
+    实例级别（非全局），每个 ApiClient / AsyncApiClient 拥有独立的 RateLimiter，线程安全。
+
+    采用令牌桶：每个类别按 1/间隔 的速率补充令牌，最多积攒 BURSTS 中对应的个数，
+    短时突发的调用无需逐个等待。lip_sync / voice_clone 的间隔对应服务端限制，
+    不允许突发（容量为 1，即严格按间隔发送）。类别 "none" 不做频率控制。
     """
 
     INTERVALS = {
         "lip_sync": 6.0,
         "voice_clone": 6.0,
         "tts": 0.5,
+        "file_detail": 0.0,
         "default": 1.0,
     }
+    # 未列出的类别容量为 1
+    BURSTS = {
+        "tts": 5,
+        "default": 5,
+    }
 
     def __init__(self) -> None:
-        self._timestamps: dict[str, float] = {}
+        # category -> (剩余令牌数, 上次补充时间 monotonic)
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
 
-    def wait(self, category: str = "default", silent: bool = False) -> None:
+    def reserve(self, category: str = "default", silent: bool = False) -> float:
+        """
+        预占一个令牌，返回调用方还需等待的秒数。
+
+        只在锁内做计算、不在锁内等待，同步与异步调用方共用。
+        """
+        if category == "none":
+            return 0.0
         interval = self.INTERVALS.get(category, self.INTERVALS["default"])
-        last_time = self._timestamps.get(category, 0)
-        elapsed = time.time() - last_time
+        if interval <= 0:
+            return 0.0
 
-        if elapsed < interval:
-            wait_time = interval - elapsed
-            if not silent:
-                logger.debug("频率控制(%s)：等待 %.1fs", category, wait_time)
-            time.sleep(wait_time)
+        burst = float(self.BURSTS.get(category, 1))
 
-        self._timestamps[category] = time.time()
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(category, (burst, now))
+            tokens = min(burst, tokens + (now - last) / interval)
+            wait_time = (1 - tokens) * interval if tokens < 1 else 0.0
+            # 先预占令牌再在锁外等待，并发调用者依次排到后续时间片
+            self._buckets[category] = (tokens - 1, now)
+
+        if wait_time > 0 and not silent:
+            logger.debug("频率控制(%s)：等待 %.1fs", category, wait_time)
+        return wait_time
+
+    def wait(self, category: str = "default", silent: bool = False) -> None:
+        wait_time = self.reserve(category, silent=silent)
+        if wait_time > 0:
+            time.sleep(wait_time)
 
 
 # ────────────────────────── 上传进度包装器 ──────────────────────────
 
 class UploadProgress:
-    """将 bytes 包装为可读对象，requests 分块读取时触发进度回调。"""
+    """
+    包装已打开的文件对象，requests 分块读取时触发进度回调。
+
+    边读边传，内存占用与文件大小无关。
+    """
 
     def __init__(
         self,
-        data: bytes,
+        fileobj: BinaryIO | HashingFileWrapper,
+        total: int,
         desc: str = "上传",
         on_progress: Optional[Callable[[int, str], None]] = None,
     ) -> None:
-        self._data = data
-        self._total = len(data)
+        self._file = fileobj
+        self._total = total
         self._pos = 0
         self._desc = desc
-        self._last_pct = -20
+        self._total_fmt = format_file_size(total)
         self._on_progress = on_progress
+        # 下一个 20% 档位对应的字节位置，热路径只做一次整数比较
+        self._next_threshold = self._threshold_for(20)
+
+    def _threshold_for(self, pct: int) -> int:
+        return -(-self._total * pct // 100)
 
     def read(self, size: int = -1) -> bytes:
         if self._pos >= self._total:
             return b""
-        if size == -1 or size is None:
-            chunk = self._data[self._pos:]
-            self._pos = self._total
+        if size is None or size < 0:
+            chunk = self._file.read()
         else:
-            end = min(self._pos + size, self._total)
-            chunk = self._data[self._pos:end]
-            self._pos = end
-
-        if self._total > 0:
-            pct = int(self._pos / self._total * 100)
-            if pct >= self._last_pct + 20 or pct >= 100:
-                msg = f"{self._desc}: {pct}%"
-                logger.info(
-                    "%s (%s/%s)",
-                    msg,
-                    format_file_size(self._pos),
-                    format_file_size(self._total),
-                )
-                self._last_pct = pct
-                if self._on_progress:
-                    self._on_progress(pct, msg)
+            chunk = self._file.read(size)
+        pos = self._pos + len(chunk)
+        self._pos = pos
+
+        if pos >= self._next_threshold:
+            pct = pos * 100 // self._total
+            self._next_threshold = self._threshold_for((pct // 20 + 1) * 20)
+            msg = f"{self._desc}: {pct}%"
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("%s (%s/%s)", msg, format_file_size(pos), self._total_fmt)
+            if self._on_progress:
+                self._on_progress(pct, msg)
 
         return chunk
 
@@ -108,12 +191,67 @@ class ApiClient:
     """
     底层 HTTP 客户端，封装重试、频率控制和业务状态码检查。
 
-    通过注入 AuthManager 实现 Token 过期自动刷新。
+    通过注入 AuthManager 统一附加 access_token（请求时传 auth=True），
+    并在 Token 过期时自动刷新。
     """
 
-    def __init__(self, auth: AuthManager) -> None:
+    def __init__(self, auth: AuthManager, transport: str = "requests") -> None:
+        if transport not in TRANSPORTS:
+            raise ValueError(f"不支持的 transport: {transport!r}，可选 {TRANSPORTS}")
         self._auth = auth
         self._rate_limiter = RateLimiter()
+        self._transport = transport
+        # 鉴权请求头就地复用，Token 刷新后原地更新
+        self._auth_headers: dict[str, str] = {"access_token": ""}
+        self._session: Optional[requests.Session] = None
+        self._client: Optional[httpx.Client] = None
+
+        if transport == "httpx":
+            if not _HTTPX_AVAILABLE:
+                raise ImportError(
+                    "transport='httpx' 需要安装 httpx：pip install chanjingsdk[http2]"
+                )
+            self._client = httpx.Client(
+                http2=True,
+                timeout=30,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                headers={"User-Agent": USER_AGENT},
+            )
+        else:
+            # 复用 keep-alive 连接，避免每次请求重新握手 TCP + TLS；
+            # 重试由 request() 自行处理，连接池层不重试。
+            self._session = requests.Session()
+            self._session.headers["User-Agent"] = USER_AGENT
+            self._session.mount(
+                "https://",
+                HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=0),
+            )
+
+    def close(self) -> None:
+        """关闭底层连接池。"""
+        if self._client is not None:
+            self._client.close()
+        if self._session is not None:
+            self._session.close()
+
+    def _send(self, method: str, url: str, kwargs: dict[str, Any]) -> requests.Response | httpx.Response:
+        """按所选 transport 发送请求；调用方统一使用 requests 风格的参数。"""
+        if self._client is None:
+            assert self._session is not None
+            return self._session.request(method, url, **kwargs)
+
+        kwargs = dict(kwargs)
+        timeout = kwargs.get("timeout")
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            kwargs["timeout"] = httpx.Timeout(read, connect=connect)
+        data = kwargs.get("data")
+        if isinstance(data, bytes):
+            kwargs["content"] = kwargs.pop("data")
+        elif data is not None and hasattr(data, "read"):
+            del kwargs["data"]
+            kwargs["content"] = iter(lambda: data.read(64 * 1024), b"")
+        return self._client.request(method, url, **kwargs)
 
     # ── 基础 HTTP 请求 ──
 
@@ -126,33 +264,40 @@ class ApiClient:
         retry_delay: int = 3,
         rate_category: str = "default",
         silent_rate: bool = False,
+        auth: bool = False,
+        _internal: bool = False,
         **kwargs: Any,
-    ) -> requests.Response:
-        """带重试和频率控制的 HTTP 请求。"""
-        self._rate_limiter.wait(rate_category, silent=silent_rate)
+    ) -> requests.Response | httpx.Response:
+        """
+        带重试和频率控制的 HTTP 请求。
 
+        auth=True 时自动附加 access_token 请求头。
+        _internal=True 用于 SDK 内部请求（Token 刷新、刷新后的重发），不占用频率配额。
+        """
+        if not _internal:
+            self._rate_limiter.wait(rate_category, silent=silent_rate)
+
+        if auth:
+            token = self._auth.get_token(self)
+            if self._auth_headers["access_token"] != token:
+                self._auth_headers["access_token"] = token
+            headers = kwargs.get("headers")
+            kwargs["headers"] = {**self._auth_headers, **headers} if headers else self._auth_headers
+
+        encode_json_body(kwargs, "data")
+        kwargs.setdefault("timeout", 30)
         last_exception: Optional[Exception] = None
         for attempt in range(1, max_retries + 1):
             try:
-                if "timeout" not in kwargs:
-                    kwargs["timeout"] = 30
-                response = requests.request(method, url, **kwargs)
+                response = self._send(method, url, kwargs)
                 response.raise_for_status()
                 return response
-            except requests.exceptions.ConnectionError as e:
-                last_exception = e
-                if attempt < max_retries:
-                    logger.warning("网络连接失败，%ds后重试 (%d/%d)", retry_delay, attempt, max_retries)
-                    time.sleep(retry_delay)
-            except requests.exceptions.Timeout as e:
+            except _RETRYABLE_ERRORS as e:
                 last_exception = e
                 if attempt < max_retries:
-                    logger.warning("请求超时，%ds后重试 (%d/%d)", retry_delay, attempt, max_retries)
+                    reason = "请求超时" if isinstance(e, _TIMEOUT_ERRORS) else "网络连接失败"
+                    logger.warning("%s，%ds后重试 (%d/%d)", reason, retry_delay, attempt, max_retries)
                     time.sleep(retry_delay)
-            except requests.exceptions.HTTPError:
-                raise
-            except Exception:
-                raise
 
         raise ConnectionError(f"请求失败（已重试{max_retries}次）: {last_exception}")
 
@@ -166,6 +311,7 @@ class ApiClient:
         rate_category: str = "default",
         silent_rate: bool = False,
         _retried_auth: bool = False,
+        _internal: bool = False,
         **kwargs: Any,
     ) -> dict:
         """发送请求并解析 JSON，检查业务状态码，Token 过期时自动刷新。"""
@@ -173,9 +319,10 @@ class ApiClient:
             method, url,
             rate_category=rate_category,
             silent_rate=silent_rate,
+            _internal=_internal,
             **kwargs,
         )
-        result = response.json()
+        result = json_loads(response.content)
         code = result.get("code")
 
         if code == 0:
@@ -183,31 +330,23 @@ class ApiClient:
 
         msg = result.get("msg", "未知错误")
 
-        if code in (10400, 10401) and not _retried_auth:
+        if code in AUTH_ERROR_CODES and not _retried_auth:
             logger.warning("AccessToken 已失效 (code=%d)，正在自动刷新...", code)
-            self._auth.reset()
-            new_token = self._auth.get_token(self)
-            headers = kwargs.get("headers", {})
-            if isinstance(headers, dict) and "access_token" in headers:
-                headers = dict(headers)
-                headers["access_token"] = new_token
-                kwargs["headers"] = headers
+            self._auth.force_refresh(self, stale=response.request.headers.get("access_token"))
+            # 本次请求已经过频率控制，重发不再等待
             return self.json_request(
                 method, url,
                 rate_category=rate_category,
-                silent_rate=silent_rate,
                 _retried_auth=True,
+                _internal=True,
                 **kwargs,
             )
 
-        if code in (10400, 10401):
-            raise PermissionError(
-                f"AccessToken 验证失败 (code={code}): {msg}\n"
-                f"请检查 app_id / secret_key 是否正确。\n"
-                f"获取凭证: https://www.chanjing.cc/platform/api_keys"
-            )
+        raise api_error(code, msg)
 
-        raise RuntimeError(f"API 请求失败 (code={code}): {msg}")
+    def _internal_json_request(self, method: str, url: str, **kwargs: Any) -> dict:
+        """SDK 内部 JSON 请求：跳过频率控制，且不触发 Token 自动刷新。"""
+        return self.json_request(method, url, _retried_auth=True, _internal=True, **kwargs)
 
     # ── 文件上传 ──
 
@@ -215,19 +354,20 @@ class ApiClient:
         self,
         file_path: str,
         service: str,
-        access_token: str,
         on_progress: Optional[Callable[[int, str], None]] = None,
+        hash_content: bool = False,
     ) -> dict[str, str]:
         """
         两步上传文件到蝉镜平台 + 轮询文件同步状态。
 
-        返回 {"file_id": "...", "url": "..."}
+        返回 {"file_id": "...", "url": "..."}；hash_content=True 时边传边计算内容哈希，
+        完整读取一遍文件后在结果中附带 "content_hash"（与 file_content_hash 一致）。
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"文件不存在: {file_path}")
-
+        try:
+            file_size = os.path.getsize(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"文件不存在: {file_path}") from None
         file_name = os.path.basename(file_path)
-        file_size = os.path.getsize(file_path)
         file_label = "视频" if "video" in service else "音频"
 
         logger.info("开始上传%s: %s (%s)", file_label, file_name, format_file_size(file_size))
@@ -235,10 +375,10 @@ class ApiClient:
         # 步骤1：获取上传地址
         result = self.json_request(
             "GET",
-            f"{BASE_URL}/open/v1/common/create_upload_url",
+            UPLOAD_URL_ENDPOINT,
             rate_category="default",
             params={"service": service, "name": file_name},
-            headers={"access_token": access_token},
+            auth=True,
         )
 
         upload_data = result.get("data", {})
@@ -247,65 +387,85 @@ class ApiClient:
         file_url = upload_data.get("full_path", "")
         mime_type = upload_data.get("mime_type", "application/octet-stream")
 
-        # 步骤2：PUT 上传
-        with open(file_path, "rb") as f:
-            file_data = f.read()
-        data_size = len(file_data)
+        # 步骤2：PUT 上传，完成后轮询同步状态
+        content_hash = self._put_file(
+            sign_url, file_path, file_size, mime_type, file_label, on_progress, hash_content,
+        )
+        logger.info("%s上传成功，file_id=%s", file_label, file_id)
+        self._poll_file_status(file_id)
 
-        upload_body = UploadProgress(file_data, f"上传{file_label}", on_progress=on_progress)
+        uploaded = {"file_id": file_id, "url": file_url}
+        if content_hash:
+            uploaded["content_hash"] = content_hash
+        return uploaded
 
-        response = self.request(
-            "PUT", sign_url,
-            max_retries=2,
-            rate_category="default",
-            headers={
-                "Content-Type": mime_type,
-                "Content-Length": str(data_size),
-            },
-            data=upload_body,
-            timeout=(15, 120),
-        )
+    def _put_file(
+        self,
+        sign_url: str,
+        file_path: str,
+        file_size: int,
+        mime_type: str,
+        file_label: str,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+        hash_content: bool = False,
+    ) -> Optional[str]:
+        """
+        流式 PUT 上传文件到预签名地址，上传期间保持文件打开。
+
+        hash_content=True 时返回上传内容的哈希；重试导致读取字节数与文件大小不符时返回 None。
+        """
+        with open(file_path, "rb") as f:
+            source = HashingFileWrapper(f) if hash_content else f
+            upload_body = UploadProgress(source, file_size, f"上传{file_label}", on_progress=on_progress)
+            response = self.request(
+                "PUT", sign_url,
+                max_retries=2,
+                rate_category="default",
+                headers={
+                    "Content-Type": mime_type,
+                    "Content-Length": str(file_size),
+                },
+                data=upload_body,
+                timeout=(15, 120),
+            )
 
         if response.status_code != 200:
             raise RuntimeError(f"文件上传失败: HTTP {response.status_code}")
 
-        logger.info("%s上传成功，file_id=%s", file_label, file_id)
-
-        # 轮询文件同步状态
-        self._poll_file_status(file_id, access_token)
-
-        return {"file_id": file_id, "url": file_url}
+        if isinstance(source, HashingFileWrapper) and source.bytes_read == file_size:
+            return source.hexdigest()
+        return None
 
     def _poll_file_status(
         self,
         file_id: str,
-        access_token: str,
-        poll_interval: int = 3,
+        poll_interval: float = 0.3,
+        max_interval: float = 3.0,
         max_wait: int = 90,
     ) -> None:
-        """轮询文件状态，等待服务器同步完成（status=1）。"""
+        """
+        轮询文件状态，等待服务器同步完成（status=1）。
+
+        上传完成后立即查询一次；之后间隔从 poll_interval 起按 1.7 倍递增，上限 max_interval。
+        """
         start = time.time()
+        interval = poll_interval
         while True:
-            elapsed = time.time() - start
-            if elapsed > max_wait:
-                raise TimeoutError(f"文件同步超时（已等待 {int(elapsed)}s），file_id: {file_id}")
-            time.sleep(poll_interval)
             try:
                 detail = self.json_request(
                     "GET",
-                    f"{BASE_URL}/open/v1/common/file_detail",
-                    rate_category="default",
+                    FILE_DETAIL_ENDPOINT,
+                    rate_category="file_detail",
                     silent_rate=True,
                     params={"id": file_id},
-                    headers={"access_token": access_token},
+                    auth=True,
                 )
                 status = detail.get("data", {}).get("status", 0)
                 if status == 1:
-                    logger.info("文件同步完成（耗时 %ds）", int(time.time() - start))
+                    logger.info("文件同步完成（耗时 %.1fs）", time.time() - start)
                     return
-                if status in (98, 99, 100):
-                    status_msg = {98: "内容安全检测失败", 99: "文件已删除", 100: "文件已清理"}
-                    raise RuntimeError(f"文件不可用 (status={status}): {status_msg.get(status, '未知')}")
+                if status in FILE_UNAVAILABLE_STATUS:
+                    raise RuntimeError(f"文件不可用 (status={status}): {FILE_UNAVAILABLE_STATUS[status]}")
             except TimeoutError:
                 raise
             except RuntimeError:
@@ -313,19 +473,73 @@ class ApiClient:
             except Exception as e:
                 logger.warning("查询文件状态失败: %s，继续等待...", e)
 
+            elapsed = time.time() - start
+            if elapsed > max_wait:
+                raise TimeoutError(f"文件同步超时（已等待 {int(elapsed)}s），file_id: {file_id}")
+            time.sleep(interval)
+            interval = min(interval * 1.7, max_interval)
+
 
 # ────────────────────────── 业务工具 ──────────────────────────
 
+AUTH_ERROR_CODES = (10400, 10401)
+FILE_UNAVAILABLE_STATUS = {98: "内容安全检测失败", 99: "文件已删除", 100: "文件已清理"}
+
+
+def encode_json_body(kwargs: dict[str, Any], body_key: str) -> None:
+    """
+    把请求参数中的 json= 请求体预先编码为字节，放到 body_key（requests 为 data，httpx 为 content）。
+
+    代替 requests / httpx 内置的 json.dumps：安装了 orjson 时编码更快，重试时直接复用编码结果。
+    """
+    if "json" not in kwargs:
+        return
+    kwargs[body_key] = json_dumps_bytes(kwargs.pop("json"))
+    headers = kwargs.get("headers")
+    # headers 可能是共享的鉴权请求头，复制后再添加
+    kwargs["headers"] = {**headers, **_JSON_CONTENT_TYPE} if headers else _JSON_CONTENT_TYPE
+
+
+_JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+
+def api_error(code: Any, msg: str) -> Exception:
+    """把业务错误码转换为对应异常（鉴权失败为 PermissionError，其余为 RuntimeError）。"""
+    if code in AUTH_ERROR_CODES:
+        return PermissionError(
+            f"AccessToken 验证失败 (code={code}): {msg}\n"
+            f"请检查 app_id / secret_key 是否正确。\n"
+            f"获取凭证: https://www.chanjing.cc/platform/api_keys"
+        )
+    return RuntimeError(f"API 请求失败 (code={code}): {msg}")
+
+
 BILLING_KEYWORDS = ("扣费失败", "余额不足", "蝉豆不足", "蝉豆余额", "欠费")
+_BILLING_RE = re.compile("|".join(map(re.escape, BILLING_KEYWORDS)))
 
 
 def check_billing_error(msg: str) -> None:
     """检测扣费失败相关错误，抛出包含充值引导的异常。"""
     if not msg:
         return
-    if any(kw in msg for kw in BILLING_KEYWORDS):
+    if _BILLING_RE.search(msg):
         raise RuntimeError(
             f"蝉豆余额不足，扣费失败\n"
             f"请前往蝉镜平台充值: https://www.chanjing.cc\n"
             f"API 返回: {msg}"
         )
+
+
+def download_file(url: str, path: str) -> str:
+    """通过共用连接池把结果文件下载到本地路径，自动创建父目录。"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # 读完或出错都要关闭响应，连接才能归还连接池
+    with DOWNLOAD_SESSION.get(url, stream=True, timeout=300) as response:
+        response.raise_for_status()
+        # 直接从底层连接拷贝，由 urllib3 负责 gzip 等传输解码。
+        # urllib3 的 readinto 内部仍是 read 后再复制，复用缓冲区省不掉分配；
+        # HTTPS 连接也无法用 os.sendfile 零拷贝写入文件
+        response.raw.decode_content = True
+        with open(path, "wb") as f:
+            shutil.copyfileobj(response.raw, f, DOWNLOAD_CHUNK_SIZE)
+    return path
@@ -0,0 +1,303 @@
+"""
+异步 HTTP 请求封装：基于 httpx.AsyncClient（HTTP/2），与 ApiClient 行为一致。
+
+需要安装 httpx[http2]：pip install chanjingsdk[http2]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Optional
+
+from .api import (
+    AUTH_ERROR_CODES,
+    FILE_DETAIL_ENDPOINT,
+    FILE_UNAVAILABLE_STATUS,
+    UPLOAD_URL_ENDPOINT,
+    USER_AGENT,
+    RateLimiter,
+    UploadProgress,
+    api_error,
+    encode_json_body,
+)
+from .utils import HashingFileWrapper, format_file_size, json_loads
+
+try:
+    import httpx
+    _HTTPX_AVAILABLE = True
+except ImportError:
+    _HTTPX_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from .auth import AuthManager
+
+logger = logging.getLogger("chanjing")
+
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class AsyncApiClient:
+    """
+    异步底层 HTTP 客户端，封装重试、频率控制和业务状态码检查。
+
+    所有请求复用同一个 HTTP/2 连接池；Token 刷新在并发协程间只发起一次。
+    """
+
+    def __init__(self, auth: AuthManager) -> None:
+        if not _HTTPX_AVAILABLE:
+            raise ImportError("异步客户端需要安装 httpx：pip install chanjingsdk[http2]")
+        self._auth = auth
+        self._rate_limiter = RateLimiter()
+        self._auth_headers: dict[str, str] = {"access_token": ""}
+        # 在事件循环内首次使用时创建，避免绑定到构造时的其他事件循环
+        self._token_lock: Optional[asyncio.Lock] = None
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            headers={"User-Agent": USER_AGENT},
+        )
+
+    async def aclose(self) -> None:
+        """关闭底层连接池。"""
+        await self._client.aclose()
+
+    def _get_token_lock(self) -> asyncio.Lock:
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        return self._token_lock
+
+    async def _get_token(self) -> str:
+        async with self._get_token_lock():
+            return await self._auth.get_token_async(self)
+
+    # ── 基础 HTTP 请求 ──
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        max_retries: int = 3,
+        retry_delay: int = 3,
+        rate_category: str = "default",
+        silent_rate: bool = False,
+        auth: bool = False,
+        _internal: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        带重试和频率控制的 HTTP 请求，参数与 ApiClient.request 相同（请求体按 httpx 传参）。
+        """
+        if not _internal:
+            wait_time = self._rate_limiter.reserve(rate_category, silent=silent_rate)
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+
+        if auth:
+            token = await self._get_token()
+            if self._auth_headers["access_token"] != token:
+                self._auth_headers["access_token"] = token
+            headers = kwargs.get("headers")
+            kwargs["headers"] = {**self._auth_headers, **headers} if headers else self._auth_headers
+
+        encode_json_body(kwargs, "content")
+        last_exception: Optional[Exception] = None
+        for attempt in range(1, max_retries + 1):
+            try:
+                response = await self._client.request(method, url, **kwargs)
+                response.raise_for_status()
+                return response
+            except (httpx.NetworkError, httpx.TimeoutException) as e:
+                last_exception = e
+                if attempt < max_retries:
+                    reason = "请求超时" if isinstance(e, httpx.TimeoutException) else "网络连接失败"
+                    logger.warning("%s，%ds后重试 (%d/%d)", reason, retry_delay, attempt, max_retries)
+                    await asyncio.sleep(retry_delay)
+
+        raise ConnectionError(f"请求失败（已重试{max_retries}次）: {last_exception}")
+
+    # ── JSON 业务请求 ──
+
+    async def json_request(
+        self,
+        method: str,
+        url: str,
+        *,
+        rate_category: str = "default",
+        silent_rate: bool = False,
+        _retried_auth: bool = False,
+        _internal: bool = False,
+        **kwargs: Any,
+    ) -> dict:
+        """发送请求并解析 JSON，检查业务状态码，Token 过期时自动刷新。"""
+        response = await self.request(
+            method, url,
+            rate_category=rate_category,
+            silent_rate=silent_rate,
+            _internal=_internal,
+            **kwargs,
+        )
+        result = json_loads(response.content)
+        code = result.get("code")
+
+        if code == 0:
+            return result
+
+        msg = result.get("msg", "未知错误")
+
+        if code in AUTH_ERROR_CODES and not _retried_auth:
+            logger.warning("AccessToken 已失效 (code=%d)，正在自动刷新...", code)
+            async with self._get_token_lock():
+                token = await self._auth.force_refresh_async(
+                    self, stale=response.request.headers.get("access_token"),
+                )
+                self._auth_headers["access_token"] = token
+            return await self.json_request(
+                method, url,
+                rate_category=rate_category,
+                _retried_auth=True,
+                _internal=True,
+                **kwargs,
+            )
+
+        raise api_error(code, msg)
+
+    async def _internal_json_request(self, method: str, url: str, **kwargs: Any) -> dict:
+        """SDK 内部 JSON 请求：跳过频率控制，且不触发 Token 自动刷新。"""
+        return await self.json_request(method, url, _retried_auth=True, _internal=True, **kwargs)
+
+    # ── 文件上传 ──
+
+    async def upload_file(
+        self,
+        file_path: str,
+        service: str,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+        hash_content: bool = False,
+    ) -> dict[str, str]:
+        """
+        两步上传文件到蝉镜平台 + 轮询文件同步状态，返回值同 ApiClient.upload_file。
+        """
+        try:
+            file_size = os.path.getsize(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"文件不存在: {file_path}") from None
+        file_name = os.path.basename(file_path)
+        file_label = "视频" if "video" in service else "音频"
+
+        logger.info("开始上传%s: %s (%s)", file_label, file_name, format_file_size(file_size))
+
+        # 步骤1：获取上传地址
+        result = await self.json_request(
+            "GET",
+            UPLOAD_URL_ENDPOINT,
+            rate_category="default",
+            params={"service": service, "name": file_name},
+            auth=True,
+        )
+
+        upload_data = result.get("data", {})
+        sign_url = upload_data.get("sign_url")
+        file_id = upload_data.get("file_id")
+        file_url = upload_data.get("full_path", "")
+        mime_type = upload_data.get("mime_type", "application/octet-stream")
+
+        # 步骤2：PUT 上传，完成后轮询同步状态
+        content_hash = await self._put_file(
+            sign_url, file_path, file_size, mime_type, file_label, on_progress, hash_content,
+        )
+        logger.info("%s上传成功，file_id=%s", file_label, file_id)
+        await self._poll_file_status(file_id)
+
+        uploaded = {"file_id": file_id, "url": file_url}
+        if content_hash:
+            uploaded["content_hash"] = content_hash
+        return uploaded
+
+    async def _put_file(
+        self,
+        sign_url: str,
+        file_path: str,
+        file_size: int,
+        mime_type: str,
+        file_label: str,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+        hash_content: bool = False,
+    ) -> Optional[str]:
+        """
+        流式 PUT 上传文件到预签名地址，磁盘读取放到线程池，不阻塞事件循环。
+
+        hash_content=True 时返回上传内容的哈希。
+        """
+        f = await asyncio.to_thread(open, file_path, "rb")
+        try:
+            source = HashingFileWrapper(f) if hash_content else f
+            upload_body = UploadProgress(source, file_size, f"上传{file_label}", on_progress=on_progress)
+
+            async def _chunks() -> AsyncIterator[bytes]:
+                while chunk := await asyncio.to_thread(upload_body.read, _UPLOAD_CHUNK_SIZE):
+                    yield chunk
+
+            # 流式请求体读过即无法重放，上传请求不做重试
+            response = await self.request(
+                "PUT", sign_url,
+                max_retries=1,
+                rate_category="default",
+                headers={
+                    "Content-Type": mime_type,
+                    "Content-Length": str(file_size),
+                },
+                content=_chunks(),
+                timeout=httpx.Timeout(120, connect=15),
+            )
+        finally:
+            f.close()
+
+        if response.status_code != 200:
+            raise RuntimeError(f"文件上传失败: HTTP {response.status_code}")
+        if isinstance(source, HashingFileWrapper) and source.bytes_read == file_size:
+            return source.hexdigest()
+        return None
+
+    async def _poll_file_status(
+        self,
+        file_id: str,
+        poll_interval: float = 0.3,
+        max_interval: float = 3.0,
+        max_wait: int = 90,
+    ) -> None:
+        """轮询文件状态，等待服务器同步完成（status=1），间隔按 1.7 倍递增。"""
+        start = time.time()
+        interval = poll_interval
+        while True:
+            try:
+                detail = await self.json_request(
+                    "GET",
+                    FILE_DETAIL_ENDPOINT,
+                    rate_category="file_detail",
+                    silent_rate=True,
+                    params={"id": file_id},
+                    auth=True,
+                )
+                status = detail.get("data", {}).get("status", 0)
+                if status == 1:
+                    logger.info("文件同步完成（耗时 %.1fs）", time.time() - start)
+                    return
+                if status in FILE_UNAVAILABLE_STATUS:
+                    raise RuntimeError(f"文件不可用 (status={status}): {FILE_UNAVAILABLE_STATUS[status]}")
+            except TimeoutError:
+                raise
+            except RuntimeError:
+                raise
+            except Exception as e:
+                logger.warning("查询文件状态失败: %s，继续等待...", e)
+
+            elapsed = time.time() - start
+            if elapsed > max_wait:
+                raise TimeoutError(f"文件同步超时（已等待 {int(elapsed)}s），file_id: {file_id}")
+            await asyncio.sleep(interval)
+            interval = min(interval * 1.7, max_interval)
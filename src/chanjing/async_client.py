@@ -0,0 +1,311 @@
+"""
+AsyncCicadaClient —— 蝉镜 AI SDK 异步入口，接口与 CicadaClient 一致。
+
+需要安装 httpx[http2]：pip install chanjingsdk[http2]
+
+用法:
+    import asyncio
+    from chanjing import AsyncCicadaClient
+
+    async def main():
+        async with AsyncCicadaClient(app_id="xxx", secret_key="yyy") as client:
+            # 多个任务并发执行，共享同一个 HTTP/2 连接
+            results = await asyncio.gather(
+                client.voice_clone_and_speak(reference_audio="a.mp3", text="你好"),
+                client.voice_clone_and_speak(reference_audio="b.mp3", text="世界"),
+            )
+            # 批量任务可限制并发数
+            videos = await client.lip_sync_many([("a.mp4", "a.wav"), ("b.mp4", "b.wav")])
+
+    asyncio.run(main())
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from typing import Any, Awaitable, Callable, Iterable, Optional, Sequence
+
+from .async_api import AsyncApiClient
+from .auth import AuthManager
+from .cache import _DEFAULT_CACHE_DIR, TTSResultCache, VoiceCloneCache
+from .services.lip_sync import AsyncLipSyncService, LipSyncResult
+from .services.tts import AsyncTTSService, TTSResult
+from .services.voice_clone import AsyncVoiceCloneService
+
+logger = logging.getLogger("chanjing")
+
+
+async def _gather_limited(
+    factories: Sequence[Callable[[], Awaitable[Any]]],
+    max_concurrency: int,
+    return_exceptions: bool,
+) -> list:
+    """并发执行协程工厂，同时运行的数量不超过 max_concurrency，结果按输入顺序返回。"""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run(factory: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(_run(f) for f in factories), return_exceptions=return_exceptions)
+
+
+class AsyncCicadaClient:
+    """
+    蝉镜 AI Python SDK 异步入口。
+
+    凭证获取优先级：构造参数 > 环境变量 > ~/.chanjing/config.json
+
+    Args:
+        app_id: 蝉镜平台 App ID（可选，也可通过环境变量或配置文件提供）
+        secret_key: 蝉镜平台 Secret Key（可选）
+        cache_dir: 缓存目录，默认 ~/.chanjing/cache/
+        log_level: 日志级别，默认 INFO。设为 None 不修改日志配置。
+    """
+
+    def __init__(
+        self,
+        app_id: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        log_level: Optional[int] = logging.INFO,
+    ) -> None:
+        if log_level is not None:
+            logging.basicConfig(
+                level=log_level,
+                format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
+                datefmt="%H:%M:%S",
+            )
+
+        cache_dir = cache_dir or _DEFAULT_CACHE_DIR
+        self._init_services(
+            AuthManager(app_id, secret_key, cache_dir=cache_dir),
+            VoiceCloneCache(cache_dir),
+            TTSResultCache(cache_dir),
+        )
+        self._owns_caches = True
+
+    def _init_services(
+        self, auth: AuthManager, voice_cache: VoiceCloneCache, tts_cache: TTSResultCache,
+    ) -> None:
+        self._auth = auth
+        self._api = AsyncApiClient(auth)
+        self._voice_cache = voice_cache
+        self._tts_cache = tts_cache
+
+        self._lip_sync_svc = AsyncLipSyncService(self._api)
+        self._voice_clone_svc = AsyncVoiceCloneService(self._api, voice_cache)
+        self._tts_svc = AsyncTTSService(self._api)
+
+    @classmethod
+    def _sharing(
+        cls, auth: AuthManager, voice_cache: VoiceCloneCache, tts_cache: TTSResultCache,
+    ) -> AsyncCicadaClient:
+        """
+        复用已有的凭证和缓存对象创建实例，供 CicadaClient 的批量方法使用。
+
+        同一进程内的两个客户端共享缓存对象，避免各自加载、追加同一份索引文件；
+        aclose 时不关闭共享的缓存。
+        """
+        client = cls.__new__(cls)
+        client._init_services(auth, voice_cache, tts_cache)
+        client._owns_caches = False
+        return client
+
+    async def aclose(self) -> None:
+        """释放底层 HTTP 连接池和缓存文件句柄。"""
+        await self._api.aclose()
+        if self._owns_caches:
+            self._voice_cache.close()
+            self._tts_cache.close()
+
+    async def __aenter__(self) -> AsyncCicadaClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    # ────────────────────────── 对口型 ──────────────────────────
+
+    async def lip_sync(
+        self,
+        video: str,
+        audio: str,
+        *,
+        model: str = "pro",
+        backway: str = "forward",
+        drive_mode: str = "normal",
+        on_progress: Optional[Callable[[str, int, str], None]] = None,
+    ) -> LipSyncResult:
+        """音频驱动视频对口型，参数同 CicadaClient.lip_sync。"""
+        return await self._lip_sync_svc.create(
+            video_path=video,
+            audio_path=audio,
+            model=model,
+            backway=backway,
+            drive_mode=drive_mode,
+            on_progress=on_progress,
+        )
+
+    async def lip_sync_many(
+        self,
+        jobs: Iterable[tuple[str, str]],
+        *,
+        model: str = "pro",
+        backway: str = "forward",
+        drive_mode: str = "normal",
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+        on_progress: Optional[Callable[[int, str, int, str], None]] = None,
+    ) -> list[LipSyncResult]:
+        """
+        批量对口型，多个任务在同一事件循环中并发上传、轮询。
+
+        Args:
+            jobs: (视频路径, 音频路径) 序列
+            max_concurrency: 同时进行的任务数上限
+            return_exceptions: 为 True 时失败任务的异常放入结果列表，其余任务照常完成；
+                为 False 时第一个异常直接抛出
+            on_progress: 可选进度回调 fn(任务序号, stage, percent, message)
+            其余参数同 lip_sync。
+
+        Returns:
+            与 jobs 顺序一致的 LipSyncResult 列表
+        """
+        factories = [
+            functools.partial(
+                self.lip_sync, video, audio,
+                model=model,
+                backway=backway,
+                drive_mode=drive_mode,
+                on_progress=functools.partial(on_progress, i) if on_progress else None,
+            )
+            for i, (video, audio) in enumerate(jobs)
+        ]
+        return await _gather_limited(factories, max_concurrency, return_exceptions)
+
+    # ────────────────────────── 声音克隆 ──────────────────────────
+
+    async def clone_voice(
+        self,
+        reference_audio: str,
+        *,
+        model: str = "cicada3.0-turbo",
+        use_cache: bool = True,
+        on_progress: Optional[Callable[[str, int, str], None]] = None,
+    ) -> str:
+        """克隆声音，返回 voice_id，参数同 CicadaClient.clone_voice。"""
+        return await self._voice_clone_svc.clone(
+            audio_path=reference_audio,
+            model=model,
+            use_cache=use_cache,
+            on_progress=on_progress,
+        )
+
+    # ────────────────────────── TTS 语音合成 ──────────────────────────
+
+    async def tts(
+        self,
+        voice_id: str,
+        text: str,
+        *,
+        speed: float = 1.0,
+        pitch: float = 1.0,
+        use_cache: bool = True,
+        on_progress: Optional[Callable[[str, int, str], None]] = None,
+    ) -> TTSResult:
+        """使用已克隆的声音合成语音，参数同 CicadaClient.tts。"""
+        cache_key = TTSResultCache.make_key(voice_id, text, speed, pitch)
+        if use_cache:
+            cached = self._tts_cache.get(cache_key)
+            if cached:
+                logger.info("命中语音合成缓存，task_id=%s", cached["task_id"])
+                if on_progress:
+                    on_progress("语音合成", 100, "缓存命中")
+                result = TTSResult(
+                    audio_url=cached["audio_url"],
+                    task_id=cached["task_id"],
+                    duration=cached["duration"],
+                    cached_path=cached["path"],
+                )
+                result._save_to_cache = functools.partial(self._tts_cache.put, cache_key, result)
+                return result
+
+        result = await self._tts_svc.synthesize(
+            voice_id=voice_id,
+            text=text,
+            speed=speed,
+            pitch=pitch,
+            on_progress=on_progress,
+        )
+
+        if use_cache:
+            result._save_to_cache = functools.partial(self._tts_cache.put, cache_key, result)
+        return result
+
+    async def tts_many(
+        self,
+        voice_id: str,
+        texts: Iterable[str],
+        *,
+        speed: float = 1.0,
+        pitch: float = 1.0,
+        use_cache: bool = True,
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+        on_progress: Optional[Callable[[int, str, int, str], None]] = None,
+    ) -> list[TTSResult]:
+        """
+        用同一个声音批量合成多段文案，参数同 tts；
+        max_concurrency、return_exceptions、on_progress 含义同 lip_sync_many。
+
+        Returns:
+            与 texts 顺序一致的 TTSResult 列表
+        """
+        factories = [
+            functools.partial(
+                self.tts, voice_id, text,
+                speed=speed,
+                pitch=pitch,
+                use_cache=use_cache,
+                on_progress=functools.partial(on_progress, i) if on_progress else None,
+            )
+            for i, text in enumerate(texts)
+        ]
+        return await _gather_limited(factories, max_concurrency, return_exceptions)
+
+    # ────────────────────────── 声音克隆 + TTS 一步到位 ──────────────────────────
+
+    async def voice_clone_and_speak(
+        self,
+        reference_audio: str,
+        text: str,
+        *,
+        model: str = "cicada3.0-turbo",
+        speed: float = 1.0,
+        pitch: float = 1.0,
+        use_cache: bool = True,
+        on_progress: Optional[Callable[[str, int, str], None]] = None,
+    ) -> TTSResult:
+        """
+        声音克隆 + 语音合成一步完成，参数同 CicadaClient.voice_clone_and_speak。
+
+        单次调用内合成依赖克隆得到的 voice_id，仍按顺序执行；
+        多次调用可通过 asyncio.gather 并发。
+        """
+        voice_id = await self.clone_voice(
+            reference_audio=reference_audio,
+            model=model,
+            use_cache=use_cache,
+            on_progress=on_progress,
+        )
+        return await self.tts(
+            voice_id=voice_id,
+            text=text,
+            speed=speed,
+            pitch=pitch,
+            use_cache=use_cache,
+            on_progress=on_progress,
+        )
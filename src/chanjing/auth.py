@@ -9,15 +9,21 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
 import hashlib
-import json
 import logging
 import os
+import threading
 import time
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from .utils import json_dumps, json_loads
 
 if TYPE_CHECKING:
     from .api import ApiClient
+    from .async_api import AsyncApiClient
 
 logger = logging.getLogger("chanjing")
 
@@ -25,12 +31,37 @@ _DEFAULT_CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".chanjing")
 _DEFAULT_CONFIG_FILE = os.path.join(_DEFAULT_CONFIG_DIR, "config.json")
 
 
+def _load_config_file() -> tuple[str, str]:
+    """读取配置文件中的 (app_id, secret_key)，缺失时为空串。"""
+    try:
+        with open(_DEFAULT_CONFIG_FILE, "rb") as f:
+            config = json_loads(f.read())
+        return config.get("app_id", "").strip(), config.get("secret_key", "").strip()
+    except Exception:
+        return "", ""
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env_and_file_creds() -> tuple[str, str]:
+    """
+    按 环境变量 > 配置文件 解析凭证，缺失时为空串。
+
+    进程内只解析一次，频繁创建客户端时不再重复读环境变量和配置文件；
+    修改环境变量或配置文件后需调用 AuthManager.clear_credential_cache()。
+    """
+    env_app_id = os.environ.get("CHANJING_APP_ID", "").strip()
+    env_secret = os.environ.get("CHANJING_SECRET_KEY", "").strip()
+    if env_app_id and env_secret:
+        return env_app_id, env_secret
+    return _load_config_file()
+
+
 class AuthManager:
     """
     实例级鉴权管理器。
 
     - 通过构造参数 / 环境变量 / 配置文件获取凭证
-    - Token 缓存到磁盘（~/.chanjing/cache/token.json），24h 有效
+    - Token 缓存到磁盘（~/.chanjing/cache/token.json，权限 600，原子替换写入），24h 有效
     - 凭证变更自动作废旧 Token
     - Token 过期前 5 分钟自动刷新
     """
@@ -40,15 +71,25 @@ class AuthManager:
         app_id: Optional[str] = None,
         secret_key: Optional[str] = None,
         cache_dir: Optional[str] = None,
+        fsync_token_cache: bool = False,
     ) -> None:
         self._app_id, self._secret_key = self._resolve_credentials(app_id, secret_key)
         self._cache_dir = cache_dir or os.path.join(_DEFAULT_CONFIG_DIR, "cache")
         self._token_cache_file = os.path.join(self._cache_dir, "token.json")
+        # 写入后是否 fsync；token 丢失只需重新获取，默认不付出刷盘开销
+        self._fsync_token_cache = fsync_token_cache
 
         self._config_hash = self._compute_hash(self._app_id, self._secret_key)
         self._token: Optional[str] = None
         self._token_expire: float = 0
+        # 提前 5 分钟视为过期，刷新时预先算好，热路径只做一次比较
+        self._token_soft_expire: float = 0
         self._token_config_hash: Optional[str] = None
+        # 磁盘 token 缓存每个实例只读一次，reset() 后也不再重读
+        self._disk_loaded = False
+        # 多线程同时需要刷新时只发起一次请求；
+        # CicadaClient 的批量接口让同步线程与事件循环共用同一个实例，异步路径也持有此锁
+        self._lock = threading.Lock()
 
     # ── 凭证解析 ──
 
@@ -62,23 +103,12 @@ class AuthManager:
         if app_id and secret_key:
             return app_id.strip(), secret_key.strip()
 
-        # 2. 环境变量
-        env_app_id = os.environ.get("CHANJING_APP_ID", "").strip()
-        env_secret = os.environ.get("CHANJING_SECRET_KEY", "").strip()
-        if env_app_id and env_secret:
-            return env_app_id, env_secret
-
-        # 3. 配置文件
-        if os.path.exists(_DEFAULT_CONFIG_FILE):
-            try:
-                with open(_DEFAULT_CONFIG_FILE, "r", encoding="utf-8") as f:
-                    config = json.load(f)
-                file_app_id = config.get("app_id", "").strip()
-                file_secret = config.get("secret_key", "").strip()
-                if file_app_id and file_secret:
-                    return file_app_id, file_secret
-            except Exception:
-                pass
+        # 2. 环境变量 / 3. 配置文件（进程内缓存）
+        cached_app_id, cached_secret = _load_env_and_file_creds()
+        if cached_app_id and cached_secret:
+            return cached_app_id, cached_secret
+        # 未找到凭证时不保留缓存，补充配置后可直接重试
+        _load_env_and_file_creds.cache_clear()
 
         raise ValueError(
             "未找到蝉镜 AI 凭证。请通过以下任一方式配置：\n"
@@ -88,40 +118,54 @@ class AuthManager:
             "获取凭证: https://www.chanjing.cc/platform/api_keys"
         )
 
+    @staticmethod
+    def clear_credential_cache() -> None:
+        """清除进程内缓存的环境变量 / 配置文件凭证，下次创建实例时重新读取。"""
+        _load_env_and_file_creds.cache_clear()
+
     @staticmethod
     def _compute_hash(app_id: str, secret_key: str) -> str:
-        return hashlib.md5(f"{app_id}:{secret_key}".encode()).hexdigest()
+        return hashlib.blake2b(f"{app_id}:{secret_key}".encode(), digest_size=16).hexdigest()
 
     # ── Token 缓存 ──
 
     def _load_token_cache(self) -> None:
         try:
-            if os.path.exists(self._token_cache_file):
-                with open(self._token_cache_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self._token = data.get("access_token")
-                    self._token_expire = data.get("expire_time", 0)
-                    self._token_config_hash = data.get("config_hash")
+            with open(self._token_cache_file, "rb") as f:
+                data = json_loads(f.read())
+            self._token = data.get("access_token")
+            self._token_expire = data.get("expire_time", 0)
+            self._token_soft_expire = self._token_expire - 300
+            self._token_config_hash = data.get("config_hash")
         except Exception:
-            self._token = None
-            self._token_expire = 0
-            self._token_config_hash = None
+            self.reset()
 
     def _save_token_cache(self) -> None:
+        """先写临时文件再原子替换，崩溃或并发读取都不会看到写了一半的文件。"""
+        tmp_file = f"{self._token_cache_file}.{os.getpid()}.tmp"
+        data = json_dumps(
+            {
+                "access_token": self._token,
+                "expire_time": self._token_expire,
+                "config_hash": self._config_hash,
+            },
+            indent=True,
+        ).encode("utf-8")
         try:
             os.makedirs(self._cache_dir, exist_ok=True)
-            with open(self._token_cache_file, "w", encoding="utf-8") as f:
-                json.dump(
-                    {
-                        "access_token": self._token,
-                        "expire_time": self._token_expire,
-                        "config_hash": self._config_hash,
-                    },
-                    f,
-                    indent=2,
-                )
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if self._fsync_token_cache:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_file, self._token_cache_file)
         except Exception as e:
             logger.warning("保存 token 缓存失败: %s", e)
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
 
     # ── 核心方法 ──
 
@@ -130,23 +174,39 @@ class AuthManager:
 
     def _refresh_token(self, api: ApiClient) -> None:
         """向蝉镜 API 请求新 token。"""
-        from .api import BASE_URL
+        from .api import ACCESS_TOKEN_ENDPOINT
 
         logger.info("正在获取 AccessToken...")
-        result = api.json_request(
+        result = api._internal_json_request(
             "POST",
-            f"{BASE_URL}/open/v1/access_token",
-            _retried_auth=True,
+            ACCESS_TOKEN_ENDPOINT,
             json={"app_id": self._app_id, "secret_key": self._secret_key},
         )
-        data = result.get("data", {})
-        self._token = data.get("access_token")
-        self._token_expire = time.time() + 24 * 3600
-        self._token_config_hash = self._config_hash
+        self._store_token(result)
+
+    async def _refresh_token_async(self, api: AsyncApiClient) -> None:
+        """_refresh_token 的异步版本。"""
+        from .api import ACCESS_TOKEN_ENDPOINT
+
+        logger.info("正在获取 AccessToken...")
+        result = await api._internal_json_request(
+            "POST",
+            ACCESS_TOKEN_ENDPOINT,
+            json={"app_id": self._app_id, "secret_key": self._secret_key},
+        )
+        self._store_token(result)
 
-        if not self._token:
+    def _store_token(self, result: dict) -> None:
+        """校验接口返回的 token 并写入内存与磁盘缓存。"""
+        token = result.get("data", {}).get("access_token")
+        if not token:
             raise RuntimeError("API 返回的 access_token 为空，请检查 app_id / secret_key 是否正确")
 
+        self._token = token
+        self._token_expire = time.time() + 24 * 3600
+        self._token_soft_expire = self._token_expire - 300
+        self._token_config_hash = self._config_hash
+
         self._save_token_cache()
         logger.info("AccessToken 获取成功并已缓存")
 
@@ -156,31 +216,98 @@ class AuthManager:
 
         优先使用内存/磁盘缓存，过期前 5 分钟自动刷新。
         """
-        now = time.time()
-
-        if self._config_changed():
-            self._token = None
-            self._token_expire = 0
-            self._token_config_hash = None
-
-        if self._token and now < self._token_expire - 300:
+        token = self._token
+        if token is not None and time.time() < self._token_soft_expire:
+            return token
+
+        with self._lock:
+            # 等锁期间其他线程可能已刷新
+            token = self._token
+            if token is not None and time.time() < self._token_soft_expire:
+                return token
+
+            token = self._token_from_disk()
+            if token is not None:
+                return token
+
+            self._refresh_token(api)
+            return self._token  # type: ignore[return-value]
+
+    async def get_token_async(self, api: AsyncApiClient) -> str:
+        """get_token 的异步版本，需要刷新时通过 AsyncApiClient 请求。"""
+        token = self._token
+        if token is not None and time.time() < self._token_soft_expire:
+            return token
+
+        async with self._locked_async():
+            token = self._token
+            if token is not None and time.time() < self._token_soft_expire:
+                return token
+
+            token = self._token_from_disk()
+            if token is not None:
+                return token
+
+            await self._refresh_token_async(api)
+            return self._token  # type: ignore[return-value]
+
+    @contextlib.asynccontextmanager
+    async def _locked_async(self) -> AsyncIterator[None]:
+        """在线程池中等待 _lock，不阻塞事件循环。"""
+        acquire = asyncio.ensure_future(asyncio.to_thread(self._lock.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # 等待被取消时线程仍可能拿到锁，拿到后立即释放
+            def release(f: asyncio.Future[bool]) -> None:
+                if not f.cancelled() and f.exception() is None:
+                    self._lock.release()
+
+            acquire.add_done_callback(release)
+            raise
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+    def _token_from_disk(self) -> Optional[str]:
+        """首次需要 token 时读取磁盘缓存，仍有效则返回；否则返回 None。"""
+        if self._disk_loaded:
+            return None
+        self._disk_loaded = True
+        self._load_token_cache()
+        if (
+            self._token
+            and not self._config_changed()
+            and time.time() < self._token_soft_expire
+        ):
+            logger.debug("使用缓存的 AccessToken")
             return self._token
+        self.reset()
+        return None
 
-        if self._token is None:
-            self._load_token_cache()
-            if self._token and now < self._token_expire - 300 and not self._config_changed():
-                logger.debug("使用缓存的 AccessToken")
-                return self._token
-            if self._config_changed():
-                self._token = None
-                self._token_expire = 0
-                self._token_config_hash = None
+    def force_refresh(self, api: ApiClient, stale: Optional[str] = None) -> str:
+        """
+        服务端判定 Token 失效时调用：直接向 API 换取新 Token 并覆盖缓存。
 
-        self._refresh_token(api)
-        return self._token  # type: ignore[return-value]
+        stale 为失效请求所用的 Token；多个线程同时失效时，
+        已被其他线程换掉的 Token 不再重复刷新。
+        """
+        with self._lock:
+            if stale is None or self._token == stale:
+                self._refresh_token(api)
+            return self._token  # type: ignore[return-value]
+
+    async def force_refresh_async(self, api: AsyncApiClient, stale: Optional[str] = None) -> str:
+        """force_refresh 的异步版本。"""
+        async with self._locked_async():
+            if stale is None or self._token == stale:
+                await self._refresh_token_async(api)
+            return self._token  # type: ignore[return-value]
 
     def reset(self) -> None:
         """重置鉴权状态，强制下次刷新 Token。"""
         self._token = None
         self._token_expire = 0
+        self._token_soft_expire = 0
         self._token_config_hash = None
@@ -1,49 +1,192 @@
 """
-声音克隆结果缓存。
+本地结果缓存。
 
-缓存 key = md5(音频文件内容) + model_type
-缓存 value = voice_id（蝉镜平台返回的克隆声音 ID）
+声音克隆缓存：
+    缓存 key = blake2b-128(音频文件内容) + model_type
+    缓存 value = voice_id（蝉镜平台返回的克隆声音 ID）
 
-同一个音频文件 + 同一个模型，克隆结果相同，无需重复克隆。
+    旧版本以 MD5 为 key 写入的条目没有 hash_algo 字段，按未命中处理。
+    同一个音频文件 + 同一个模型，克隆结果相同，无需重复克隆。
+
+    另按 (绝对路径, mtime, 文件大小) 记录参考音频的内容哈希，
+    文件未改动时直接复用，缓存命中无需重新读取整个文件。
+
+语音合成缓存：
+    缓存 key = blake2b-128(voice_id + 文案 + 语速 + 音调)
+    缓存 value = 原始 audio_url + 已下载的音频文件（cache_dir/tts/<key>.mp3）
+
+    合成时不下载音频；调用 TTSResult.download() 后才把文件复制进缓存，超出上限的文件不缓存。
+    相同参数的合成请求直接返回缓存结果，不再调用接口，download() 从本地文件复制。
+    旧版本写入的条目没有 audio_url 字段，按未命中处理。
+    按文件 mtime 做 LRU 淘汰，总大小不超过上限（默认 10 MB）。
+
+索引均为 JSON Lines 格式：每次写入只追加一行，同一 key 以最后一行为准，
+失效行超过有效条目两倍时整体重写压缩。
 """
 
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
 import os
+import shutil
+import threading
 import time
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, TextIO
+
+from .utils import CONTENT_HASH_ALGO, infer_extension_from_url, json_dumps, json_loads
+
+if TYPE_CHECKING:
+    from .services.tts import TTSResult
 
 logger = logging.getLogger("chanjing")
 
+_DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".chanjing", "cache")
 
-class VoiceCloneCache:
-    """实例级声音克隆缓存，持久化到磁盘。"""
 
-    def __init__(self, cache_dir: str) -> None:
-        self._cache_file = os.path.join(cache_dir, "voice_clone.json")
-        self._cache: Optional[dict] = None
+class _JsonLinesStore:
+    """
+    以 JSON Lines 追加写入的 key-value 存储，首次访问时加载到内存。
 
-    def _load(self) -> None:
-        if self._cache is not None:
-            return
+    非线程安全，由调用方加锁。
+    """
+
+    def __init__(self, path: str, desc: str) -> None:
+        self._path = path
+        self._desc = desc
+        self._data: Optional[dict[str, dict]] = None
+        self._lines = 0
+        self._fh: Optional[TextIO] = None
+        self._torn_tail = False
+
+    def _load(self) -> dict[str, dict]:
+        if self._data is not None:
+            return self._data
+        data: dict[str, dict] = {}
+        lines = 0
         try:
-            if os.path.exists(self._cache_file):
-                with open(self._cache_file, "r", encoding="utf-8") as f:
-                    self._cache = json.load(f)
-            else:
-                self._cache = {}
-        except Exception:
-            self._cache = {}
-
-    def _save(self) -> None:
+            with open(self._path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._torn_tail = not line.endswith("\n")
+                    if not line.strip():
+                        continue
+                    lines += 1
+                    try:
+                        record = json_loads(line)
+                        key = record.pop("key")
+                    except (ValueError, KeyError, AttributeError):
+                        continue  # 写入中途中断留下的残行
+                    if record.pop("deleted", False):
+                        data.pop(key, None)
+                    else:
+                        data[key] = record
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("读取%s失败: %s", self._desc, e)
+        self._data = data
+        self._lines = lines
+        return data
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._load().get(key)
+
+    def keys(self) -> list[str]:
+        return list(self._load())
+
+    def set(self, key: str, entry: dict) -> None:
+        self._load()[key] = entry
+        self._append({"key": key, **entry})
+
+    def delete(self, key: str) -> None:
+        data = self._load()
+        if key in data:
+            del data[key]
+            self._append({"key": key, "deleted": True})
+
+    def _append(self, record: dict) -> None:
+        try:
+            if self._fh is None:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                self._fh = open(self._path, "a", encoding="utf-8")
+                if self._torn_tail:
+                    self._fh.write("\n")
+                    self._torn_tail = False
+            self._fh.write(json_dumps(record) + "\n")
+            self._fh.flush()
+            self._lines += 1
+        except Exception as e:
+            logger.warning("保存%s失败: %s", self._desc, e)
+            return
+        if self._lines > 2 * len(self._load()):
+            self._compact()
+
+    def _compact(self) -> None:
+        """用当前有效条目重写索引文件。"""
+        data = self._load()
+        self.close()
+        tmp_path = self._path + ".tmp"
         try:
-            os.makedirs(os.path.dirname(self._cache_file), exist_ok=True)
-            with open(self._cache_file, "w", encoding="utf-8") as f:
-                json.dump(self._cache, f, indent=2, ensure_ascii=False)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for key, entry in data.items():
+                    f.write(json_dumps({"key": key, **entry}) + "\n")
+            os.replace(tmp_path, self._path)
+            self._lines = len(data)
+            self._torn_tail = False
         except Exception as e:
-            logger.warning("保存声音克隆缓存失败: %s", e)
+            logger.warning("压缩%s失败: %s", self._desc, e)
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class VoiceCloneCache:
+    """实例级声音克隆缓存，持久化到磁盘。线程安全。"""
+
+    MAX_FILE_RECORDS = 256
+
+    def __init__(self, cache_dir: str) -> None:
+        self._store = _JsonLinesStore(os.path.join(cache_dir, "voice_clone.jsonl"), "声音克隆缓存")
+        self._files = _JsonLinesStore(os.path.join(cache_dir, "voice_clone_files.jsonl"), "参考音频哈希缓存")
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """关闭缓存文件句柄。"""
+        with self._lock:
+            self._store.close()
+            self._files.close()
+
+    def get_file_hash(self, file_path: str, st: os.stat_result) -> Optional[str]:
+        """文件自记录后未改动（mtime 与大小一致）时返回记录的内容哈希。"""
+        with self._lock:
+            entry = self._files.get(os.path.abspath(file_path))
+        if (
+            entry
+            and entry.get("hash_algo") == CONTENT_HASH_ALGO
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and entry.get("size") == st.st_size
+        ):
+            return entry.get("hash")
+        return None
+
+    def put_file_hash(self, file_path: str, st: os.stat_result, file_hash: str) -> None:
+        """记录文件内容哈希；st 须在计算哈希之前获取，避免记下计算期间被改动的文件。"""
+        with self._lock:
+            self._files.set(
+                os.path.abspath(file_path),
+                {
+                    "hash": file_hash,
+                    "hash_algo": CONTENT_HASH_ALGO,
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                },
+            )
+            # 超出上限时删除最早记录的文件
+            keys = self._files.keys()
+            for key in keys[: max(0, len(keys) - self.MAX_FILE_RECORDS)]:
+                self._files.delete(key)
 
     @staticmethod
     def _make_key(file_hash: str, model_type: str) -> str:
@@ -51,31 +194,140 @@ class VoiceCloneCache:
 
     def get(self, file_hash: str, model_type: str) -> Optional[str]:
         """查询缓存，返回 voice_id 或 None。"""
-        self._load()
-        assert self._cache is not None
-        key = self._make_key(file_hash, model_type)
-        entry = self._cache.get(key)
-        if entry:
+        with self._lock:
+            entry = self._store.get(self._make_key(file_hash, model_type))
+        if entry and entry.get("hash_algo") == CONTENT_HASH_ALGO:
             return entry.get("voice_id")
         return None
 
     def put(self, file_hash: str, model_type: str, voice_id: str) -> None:
         """写入缓存。"""
-        self._load()
-        assert self._cache is not None
-        key = self._make_key(file_hash, model_type)
-        self._cache[key] = {
-            "voice_id": voice_id,
-            "model_type": model_type,
-            "created_at": time.time(),
-        }
-        self._save()
+        with self._lock:
+            self._store.set(
+                self._make_key(file_hash, model_type),
+                {
+                    "voice_id": voice_id,
+                    "model_type": model_type,
+                    "hash_algo": CONTENT_HASH_ALGO,
+                    "created_at": time.time(),
+                },
+            )
+
+    def has_model(self, model_type: str) -> bool:
+        """是否存在该模型的缓存条目；不存在时任何查询都不会命中。"""
+        with self._lock:
+            for key in self._store.keys():
+                entry = self._store.get(key)
+                if entry and entry.get("model_type") == model_type and entry.get("hash_algo") == CONTENT_HASH_ALGO:
+                    return True
+        return False
 
     def remove(self, file_hash: str, model_type: str) -> None:
         """删除某条缓存。"""
-        self._load()
-        assert self._cache is not None
-        key = self._make_key(file_hash, model_type)
-        if key in self._cache:
-            del self._cache[key]
-            self._save()
+        with self._lock:
+            self._store.delete(self._make_key(file_hash, model_type))
+
+
+class TTSResultCache:
+    """实例级语音合成结果缓存，音频文件与索引持久化到 cache_dir/tts/。线程安全。"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 10 * 1024 * 1024) -> None:
+        self._dir = os.path.join(cache_dir, "tts")
+        self._store = _JsonLinesStore(os.path.join(self._dir, "index.jsonl"), "语音合成缓存")
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """关闭缓存文件句柄。"""
+        with self._lock:
+            self._store.close()
+
+    @staticmethod
+    def make_key(voice_id: str, text: str, speed: float, pitch: float) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for part in (voice_id, text, f"{speed:.3f}", f"{pitch:.3f}"):
+            h.update(part.encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        查询缓存，返回 {"audio_url", "task_id", "duration", "path"} 或 None。
+
+        命中时刷新音频文件 mtime，作为 LRU 淘汰依据。
+        """
+        with self._lock:
+            entry = self._store.get(key)
+            if not entry or "audio_url" not in entry:
+                return None
+            path = os.path.join(self._dir, entry["file"])
+            try:
+                os.utime(path)
+            except OSError:
+                self._store.delete(key)
+                return None
+        return {
+            "audio_url": entry["audio_url"],
+            "task_id": entry["task_id"],
+            "duration": entry["duration"],
+            "path": path,
+        }
+
+    def put(self, key: str, result: TTSResult, file_path: str) -> Optional[str]:
+        """把已下载的合成音频复制进缓存，返回缓存文件路径；失败或超出容量返回 None。"""
+        file_name = key + infer_extension_from_url(result.audio_url)
+        path = os.path.join(self._dir, file_name)
+        tmp_path = path + ".tmp"
+        try:
+            if os.path.getsize(file_path) > self._max_bytes:
+                logger.debug("音频超过语音合成缓存上限，不缓存: %s", file_path)
+                return None
+            os.makedirs(self._dir, exist_ok=True)
+            shutil.copyfile(file_path, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning("写入语音合成缓存失败: %s", e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return None
+
+        with self._lock:
+            self._store.set(
+                key,
+                {
+                    "file": file_name,
+                    "audio_url": result.audio_url,
+                    "task_id": result.task_id,
+                    "duration": result.duration,
+                    "created_at": time.time(),
+                },
+            )
+            self._evict()
+            return path if os.path.exists(path) else None
+
+    def _evict(self) -> None:
+        """按 mtime 从旧到新删除音频文件，直到总大小不超过上限。"""
+        files = []
+        for key in self._store.keys():
+            entry = self._store.get(key)
+            assert entry is not None
+            path = os.path.join(self._dir, entry["file"])
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._store.delete(key)
+                continue
+            files.append((st.st_mtime, st.st_size, key, path))
+
+        total = sum(size for _, size, _, _ in files)
+        for _, size, key, path in sorted(files):
+            if total <= self._max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._store.delete(key)
+            total -= size
@@ -16,25 +16,31 @@ CicadaClient —— 蝉镜 AI SDK 统一入口。
         text="你好世界",
     )
     result.download("output.mp3")
+
+    # 批量任务在内部事件循环中并发执行（需安装 chanjingsdk[http2]）
+    results = client.lip_sync_many([("a.mp4", "a.wav"), ("b.mp4", "b.wav")])
+
+    # 用完后释放连接池（或使用 with CicadaClient() as client: ...）
+    client.close()
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
-import os
-from typing import Callable, Optional
+from typing import Any, Awaitable, Callable, Iterable, Optional
 
 from .api import ApiClient
+from .async_client import AsyncCicadaClient
 from .auth import AuthManager
-from .cache import VoiceCloneCache
+from .cache import _DEFAULT_CACHE_DIR, TTSResultCache, VoiceCloneCache
 from .services.lip_sync import LipSyncResult, LipSyncService
 from .services.tts import TTSResult, TTSService
 from .services.voice_clone import VoiceCloneService
 
 logger = logging.getLogger("chanjing")
 
-_DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".chanjing", "cache")
-
 
 class CicadaClient:
     """
@@ -47,6 +53,7 @@ class CicadaClient:
         secret_key: 蝉镜平台 Secret Key（可选）
         cache_dir: 缓存目录，默认 ~/.chanjing/cache/
         log_level: 日志级别，默认 INFO。设为 None 不修改日志配置。
+        transport: HTTP 传输层，"requests"（默认）或 "httpx"（HTTP/2，需安装 chanjingsdk[http2]）
     """
 
     def __init__(
@@ -55,6 +62,7 @@ class CicadaClient:
         secret_key: Optional[str] = None,
         cache_dir: Optional[str] = None,
         log_level: Optional[int] = logging.INFO,
+        transport: str = "requests",
     ) -> None:
         if log_level is not None:
             logging.basicConfig(
@@ -65,15 +73,36 @@ class CicadaClient:
 
         self._cache_dir = cache_dir or _DEFAULT_CACHE_DIR
         self._auth = AuthManager(app_id, secret_key, cache_dir=self._cache_dir)
-        self._api = ApiClient(self._auth)
+        self._api = ApiClient(self._auth, transport=transport)
         self._voice_cache = VoiceCloneCache(self._cache_dir)
+        self._tts_cache = TTSResultCache(self._cache_dir)
 
         self._lip_sync_svc = LipSyncService(self._api)
         self._voice_clone_svc = VoiceCloneService(self._api, self._voice_cache)
         self._tts_svc = TTSService(self._api)
 
-    def _get_token(self) -> str:
-        return self._auth.get_token(self._api)
+    def close(self) -> None:
+        """释放底层 HTTP 连接池和缓存文件句柄。"""
+        self._api.close()
+        self._voice_cache.close()
+        self._tts_cache.close()
+
+    def __enter__(self) -> CicadaClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _run_async(self, fn: Callable[[AsyncCicadaClient], Awaitable[Any]]) -> Any:
+        """在新的事件循环中运行异步批量方法，复用本实例的凭证和缓存。"""
+        async def _main() -> Any:
+            client = AsyncCicadaClient._sharing(self._auth, self._voice_cache, self._tts_cache)
+            try:
+                return await fn(client)
+            finally:
+                await client.aclose()
+
+        return asyncio.run(_main())
 
     # ────────────────────────── 对口型 ──────────────────────────
 
@@ -101,17 +130,53 @@ class CicadaClient:
         Returns:
             LipSyncResult 对象，包含 video_url、task_id，可调用 .download() 保存到本地
         """
-        token = self._get_token()
         return self._lip_sync_svc.create(
             video_path=video,
             audio_path=audio,
-            access_token=token,
             model=model,
             backway=backway,
             drive_mode=drive_mode,
             on_progress=on_progress,
         )
 
+    def lip_sync_many(
+        self,
+        jobs: Iterable[tuple[str, str]],
+        *,
+        model: str = "pro",
+        backway: str = "forward",
+        drive_mode: str = "normal",
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+        on_progress: Optional[Callable[[int, str, int, str], None]] = None,
+    ) -> list[LipSyncResult]:
+        """
+        批量对口型，在内部事件循环中并发执行，不为每个任务占用一个线程。
+
+        需安装 chanjingsdk[http2]；不能在正在运行的事件循环中调用，
+        异步代码请直接使用 AsyncCicadaClient.lip_sync_many。
+
+        Args:
+            jobs: (视频路径, 音频路径) 序列
+            max_concurrency: 同时进行的任务数上限
+            return_exceptions: 为 True 时失败任务的异常放入结果列表，其余任务照常完成；
+                为 False 时第一个异常直接抛出
+            on_progress: 可选进度回调 fn(任务序号, stage, percent, message)
+            其余参数同 lip_sync。
+
+        Returns:
+            与 jobs 顺序一致的 LipSyncResult 列表
+        """
+        return self._run_async(lambda client: client.lip_sync_many(
+            jobs,
+            model=model,
+            backway=backway,
+            drive_mode=drive_mode,
+            max_concurrency=max_concurrency,
+            return_exceptions=return_exceptions,
+            on_progress=on_progress,
+        ))
+
     # ────────────────────────── 声音克隆 ──────────────────────────
 
     def clone_voice(
@@ -134,10 +199,8 @@ class CicadaClient:
         Returns:
             voice_id 字符串
         """
-        token = self._get_token()
         return self._voice_clone_svc.clone(
             audio_path=reference_audio,
-            access_token=token,
             model=model,
             use_cache=use_cache,
             on_progress=on_progress,
@@ -152,6 +215,7 @@ class CicadaClient:
         *,
         speed: float = 1.0,
         pitch: float = 1.0,
+        use_cache: bool = True,
         on_progress: Optional[Callable[[str, int, str], None]] = None,
     ) -> TTSResult:
         """
@@ -162,21 +226,69 @@ class CicadaClient:
             text: 要合成的文案（最多4000字）
             speed: 语速（0.5-2.0，默认 1.0）
             pitch: 音调（0.1-3.0，默认 1.0）
+            use_cache: 是否缓存合成结果（相同声音+文案+语速+音调不再调用接口，download() 后音频存入本地缓存）
             on_progress: 可选进度回调 fn(stage, percent, message)
 
         Returns:
             TTSResult 对象，包含 audio_url、task_id、duration，可调用 .download() 保存
         """
-        token = self._get_token()
-        return self._tts_svc.synthesize(
+        cache_key = TTSResultCache.make_key(voice_id, text, speed, pitch)
+        if use_cache:
+            cached = self._tts_cache.get(cache_key)
+            if cached:
+                logger.info("命中语音合成缓存，task_id=%s", cached["task_id"])
+                if on_progress:
+                    on_progress("语音合成", 100, "缓存命中")
+                result = TTSResult(
+                    audio_url=cached["audio_url"],
+                    task_id=cached["task_id"],
+                    duration=cached["duration"],
+                    cached_path=cached["path"],
+                )
+                result._save_to_cache = functools.partial(self._tts_cache.put, cache_key, result)
+                return result
+
+        result = self._tts_svc.synthesize(
             voice_id=voice_id,
             text=text,
-            access_token=token,
             speed=speed,
             pitch=pitch,
             on_progress=on_progress,
         )
 
+        if use_cache:
+            result._save_to_cache = functools.partial(self._tts_cache.put, cache_key, result)
+        return result
+
+    def tts_many(
+        self,
+        voice_id: str,
+        texts: Iterable[str],
+        *,
+        speed: float = 1.0,
+        pitch: float = 1.0,
+        use_cache: bool = True,
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+        on_progress: Optional[Callable[[int, str, int, str], None]] = None,
+    ) -> list[TTSResult]:
+        """
+        用同一个声音批量合成多段文案，并发方式和限制同 lip_sync_many，其余参数同 tts。
+
+        Returns:
+            与 texts 顺序一致的 TTSResult 列表
+        """
+        return self._run_async(lambda client: client.tts_many(
+            voice_id,
+            texts,
+            speed=speed,
+            pitch=pitch,
+            use_cache=use_cache,
+            max_concurrency=max_concurrency,
+            return_exceptions=return_exceptions,
+            on_progress=on_progress,
+        ))
+
     # ────────────────────────── 声音克隆 + TTS 一步到位 ──────────────────────────
 
     def voice_clone_and_speak(
@@ -201,7 +313,7 @@ class CicadaClient:
             model: 声音克隆模型
             speed: 语速（0.5-2.0）
             pitch: 音调（0.1-3.0）
-            use_cache: 是否缓存声音克隆结果
+            use_cache: 是否缓存声音克隆及语音合成结果
             on_progress: 可选进度回调 fn(stage, percent, message)
 
         Returns:
@@ -218,5 +330,6 @@ class CicadaClient:
             text=text,
             speed=speed,
             pitch=pitch,
+            use_cache=use_cache,
             on_progress=on_progress,
         )
@@ -0,0 +1,121 @@
+"""
+任务轮询公共逻辑：超时判断、连续失败计数、退避间隔和状态变化上报。
+
+各服务只需继承 TaskPoller 描述查询请求和状态判断；
+同步服务用 run_poll、异步服务用 run_poll_async 驱动，两者只在发请求和等待方式上不同。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from ..utils import backoff_delay
+
+if TYPE_CHECKING:
+    from ..api import ApiClient
+    from ..async_api import AsyncApiClient
+
+logger = logging.getLogger("chanjing")
+
+
+class TaskPoller:
+    """
+    单个任务的轮询状态机，不做任何 I/O。
+
+    子类设置 label / method / url / request_kwargs，并实现 on_state：
+    任务完成时把结果存入 self.result 并返回 True，进行中返回 False，失败时抛出异常。
+    """
+
+    label = ""
+    method = "GET"
+    url = ""
+    # 查询请求出错时可容忍的异常类型与连续次数；为空元组时异常直接抛出
+    retry_errors: tuple[type[Exception], ...] = (Exception,)
+    max_errors = 5
+    delay_cap = 5.0
+
+    def __init__(
+        self,
+        task_id: str,
+        on_progress: Optional[Callable[[str, int, str], None]],
+        max_wait: int,
+    ) -> None:
+        self.task_id = task_id
+        self.on_progress = on_progress
+        self.max_wait = max_wait
+        self.result: Any = None
+        self.request_kwargs: dict[str, Any] = {}
+        self._start = time.time()
+        self._attempt = 0
+        self._errors = 0
+        self._last_reported: Optional[tuple[Any, Any]] = None
+
+    def timeout_error(self, elapsed: float) -> TimeoutError:
+        return TimeoutError(f"{self.label}超时（{int(elapsed)}秒），task_id: {self.task_id}")
+
+    def check_timeout(self) -> None:
+        elapsed = time.time() - self._start
+        if elapsed > self.max_wait:
+            raise self.timeout_error(elapsed)
+
+    def next_delay(self) -> float:
+        delay = backoff_delay(self._attempt, cap=self.delay_cap)
+        self._attempt += 1
+        return delay
+
+    def failed(self, error: Exception) -> float:
+        """记录一次查询失败，返回重试前的等待秒数；连续失败过多时抛出异常。"""
+        self._errors += 1
+        if self._errors >= self.max_errors:
+            raise RuntimeError(f"{self.label}轮询连续失败{self.max_errors}次: {error}") from error
+        return self.next_delay()
+
+    def handle(self, response: dict) -> bool:
+        """处理一次查询结果，任务完成返回 True。"""
+        self._errors = 0
+        return self.on_state(response)
+
+    def on_state(self, response: dict) -> bool:
+        raise NotImplementedError
+
+    def report(self, status: Any, progress: int, status_text: str) -> None:
+        """状态或进度变化时记录日志并回调进度。"""
+        if self._last_reported == (status, progress):
+            return
+        self._last_reported = (status, progress)
+        logger.info("%s: %d%% - %s", self.label, progress, status_text)
+        if self.on_progress:
+            self.on_progress(self.label, progress, status_text)
+
+
+def run_poll(api: ApiClient, poller: TaskPoller) -> Any:
+    """同步轮询直到任务完成，返回 poller.result。"""
+    logger.info("等待%s完成...", poller.label)
+    while True:
+        poller.check_timeout()
+        try:
+            response = api.json_request(poller.method, poller.url, **poller.request_kwargs)
+        except poller.retry_errors as e:
+            time.sleep(poller.failed(e))
+            continue
+        if poller.handle(response):
+            return poller.result
+        time.sleep(poller.next_delay())
+
+
+async def run_poll_async(api: AsyncApiClient, poller: TaskPoller) -> Any:
+    """异步轮询直到任务完成，返回 poller.result；逻辑同 run_poll。"""
+    logger.info("等待%s完成...", poller.label)
+    while True:
+        poller.check_timeout()
+        try:
+            response = await api.json_request(poller.method, poller.url, **poller.request_kwargs)
+        except poller.retry_errors as e:
+            await asyncio.sleep(poller.failed(e))
+            continue
+        if poller.handle(response):
+            return poller.result
+        await asyncio.sleep(poller.next_delay())
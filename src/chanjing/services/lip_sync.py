@@ -4,17 +4,161 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-import time
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
-from ..api import BASE_URL, ApiClient, check_billing_error
+from ..api import BASE_URL, ApiClient, check_billing_error, download_file
 from ..utils import get_video_dimensions
+from ._polling import TaskPoller, run_poll, run_poll_async
+
+if TYPE_CHECKING:
+    from ..async_api import AsyncApiClient
 
 logger = logging.getLogger("chanjing")
 
+CREATE_ENDPOINT = f"{BASE_URL}/open/v1/video_lip_sync/create"
+DETAIL_ENDPOINT = f"{BASE_URL}/open/v1/video_lip_sync/detail"
+
+_LIP_SYNC_STATUS = {0: "排队中", 10: "生成中", 20: "成功", 30: "失败"}
+
+
+def _video_dimensions(video_path: str) -> tuple[int, int]:
+    """检测视频宽高，检测失败时使用竖屏 1080x1920。"""
+    w, h = get_video_dimensions(video_path)
+    if not w or not h:
+        w, h = 1080, 1920
+        logger.info("无法检测视频尺寸，使用默认值 %dx%d", w, h)
+    else:
+        logger.info("视频尺寸: %dx%d", w, h)
+    return w, h
+
+
+def _create_request(
+    video_file_id: str,
+    audio_file_id: str,
+    width: int,
+    height: int,
+    model: str,
+    backway: str,
+    drive_mode: str,
+) -> dict:
+    """创建对口型任务的 json_request 参数。"""
+    return {
+        "rate_category": "lip_sync",
+        "silent_rate": True,
+        "json": {
+            "video_file_id": video_file_id,
+            "audio_type": "audio",
+            "audio_file_id": audio_file_id,
+            "model": 1 if model == "pro" else 0,
+            "screen_width": width,
+            "screen_height": height,
+            "backway": 2 if backway == "reverse" else 1,
+            "drive_mode": "random" if drive_mode == "random" else "",
+        },
+        "auth": True,
+    }
+
+
+class _UploadProgressMerger:
+    """合并视频、音频并发上传的进度：按文件大小加权为一个总进度，回调加锁串行执行。"""
+
+    def __init__(
+        self,
+        on_progress: Optional[Callable[[str, int, str], None]],
+        sizes: dict[str, int],
+    ) -> None:
+        self._on_progress = on_progress
+        self._sizes = sizes
+        self._total = sum(sizes.values()) or 1
+        self._done = dict.fromkeys(sizes, 0)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def close(self) -> None:
+        """停止回调；上传失败后仍在后台进行的另一个上传不再报告进度。"""
+        with self._lock:
+            self._closed = True
+
+    def callback(self, name: str) -> Callable[[int, str], None]:
+        def _on_upload(pct: int, msg: str) -> None:
+            if not self._on_progress:
+                return
+            with self._lock:
+                if self._closed:
+                    return
+                self._done[name] = self._sizes[name] * pct
+                total_pct = sum(self._done.values()) // self._total
+                self._on_progress("上传文件", total_pct, msg)
+        return _on_upload
+
+
+def _file_size(path: str, label: str) -> int:
+    """返回文件大小；文件不存在时抛出带中文说明的 FileNotFoundError。"""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{label}不存在: {path}") from None
+
+
+def _status_text(status: Optional[int]) -> str:
+    return _LIP_SYNC_STATUS.get(status, f"未知({status})")
+
+
+def _finished_result(data: dict) -> Optional[tuple[str, int]]:
+    """任务成功时返回 (video_url, duration_ms)，失败时抛出异常，进行中返回 None。"""
+    status = data.get("status")
+    if status == 20:
+        video_url = data.get("video_url", "")
+        if not video_url:
+            raise RuntimeError("视频合成完成但未返回视频URL")
+        duration_ms = data.get("duration", 0)
+        logger.info("视频合成完成！时长: %.1f秒", duration_ms / 1000 if duration_ms else 0)
+        return video_url, duration_ms
+    if status == 30:
+        msg = data.get("msg", "")
+        check_billing_error(msg)
+        raise RuntimeError(f"视频合成失败: {msg}")
+    return None
+
+
+class _LipSyncPoller(TaskPoller):
+    """对口型任务状态：status=20 成功，30 失败；查询出错直接抛出，不做容错。"""
+
+    label = "视频合成"
+    url = DETAIL_ENDPOINT
+    retry_errors = ()
+    delay_cap = 10.0
+
+    def __init__(
+        self,
+        task_id: str,
+        on_progress: Optional[Callable[[str, int, str], None]],
+        max_wait: int = 1800,
+    ) -> None:
+        super().__init__(task_id, on_progress, max_wait)
+        self.request_kwargs = {
+            "rate_category": "default",
+            "silent_rate": True,
+            "params": {"id": task_id},
+            "auth": True,
+        }
+
+    def timeout_error(self, elapsed: float) -> TimeoutError:
+        return TimeoutError(f"对口型任务超时（{self.max_wait}秒），task_id: {self.task_id}")
+
+    def on_state(self, response: dict) -> bool:
+        data = response.get("data", {})
+        status = data.get("status")
+        self.report(status, data.get("progress", 0), _status_text(status))
+        self.result = _finished_result(data)
+        return self.result is not None
+
 
 @dataclass
 class LipSyncResult:
@@ -26,15 +170,7 @@ class LipSyncResult:
 
     def download(self, path: str) -> str:
         """下载结果视频到本地文件。"""
-        import requests as _requests
-
-        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-        response = _requests.get(self.video_url, stream=True, timeout=300)
-        response.raise_for_status()
-        with open(path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=1024 * 1024):
-                if chunk:
-                    f.write(chunk)
+        download_file(self.video_url, path)
         logger.info("视频已下载到 %s", path)
         return path
 
@@ -49,7 +185,6 @@ class LipSyncService:
         self,
         video_path: str,
         audio_path: str,
-        access_token: str,
         *,
         model: str = "pro",
         backway: str = "forward",
@@ -62,131 +197,133 @@ class LipSyncService:
         Args:
             video_path: 本地视频文件路径
             audio_path: 本地音频文件路径
-            access_token: 平台 access_token
             model: "standard" 或 "pro"
             backway: "forward"（正放）或 "reverse"（倒放）
             drive_mode: "normal"（正常驱动）或 "random"（随机帧驱动）
             on_progress: 可选进度回调 (stage, percent, message)
         """
-        if not os.path.exists(video_path):
-            raise FileNotFoundError(f"视频文件不存在: {video_path}")
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"音频文件不存在: {audio_path}")
+        sizes = {
+            "video": _file_size(video_path, "视频文件"),
+            "audio": _file_size(audio_path, "音频文件"),
+        }
 
         def _progress(stage: str, pct: int, msg: str) -> None:
             if on_progress:
                 on_progress(stage, pct, msg)
 
         _progress("准备", 0, "检测视频参数...")
+        w, h = _video_dimensions(video_path)
+
+        # 视频、音频并发上传
+        _progress("上传文件", 0, "上传视频和音频中...")
+        merger = _UploadProgressMerger(on_progress, sizes)
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chanjing-lip-sync")
+        try:
+            video_future = executor.submit(
+                self._api.upload_file, video_path, "lip_sync_video",
+                on_progress=merger.callback("video"),
+            )
+            audio_future = executor.submit(
+                self._api.upload_file, audio_path, "lip_sync_audio",
+                on_progress=merger.callback("audio"),
+            )
+            # 任一上传失败时立即抛出先发生的异常，不等另一个文件传完
+            done, _ = wait((video_future, audio_future), return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()
+            video_result = video_future.result()
+            audio_result = audio_future.result()
+        except BaseException:
+            # 进行中的 PUT 无法中断，放弃它并停止其进度回调；未开始的上传直接取消
+            merger.close()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
 
-        w, h = get_video_dimensions(video_path)
-        if not w or not h:
-            w, h = 1080, 1920
-            logger.info("无法检测视频尺寸，使用默认值 %dx%d", w, h)
-        else:
-            logger.info("视频尺寸: %dx%d", w, h)
+        # 创建任务
+        _progress("视频合成", 0, "创建任务...")
+        result = self._api.json_request(
+            "POST",
+            CREATE_ENDPOINT,
+            **_create_request(
+                video_result["file_id"], audio_result["file_id"], w, h, model, backway, drive_mode,
+            ),
+        )
+        task_id = result.get("data")
+        logger.info("对口型任务创建成功，task_id=%s", task_id)
+
+        # 轮询结果
+        video_url, duration_ms = run_poll(self._api, _LipSyncPoller(task_id, on_progress))
 
-        backway_value = 2 if backway == "reverse" else 1
-        drive_mode_value = "random" if drive_mode == "random" else ""
-        model_value = 1 if model == "pro" else 0
+        _progress("完成", 100, "对口型任务完成")
+        return LipSyncResult(video_url=video_url, task_id=task_id, duration_ms=duration_ms)
 
-        # 上传视频
-        _progress("上传视频", 0, "上传视频中...")
 
-        def _on_video_upload(pct: int, msg: str) -> None:
-            _progress("上传视频", pct, msg)
+class AsyncLipSyncService:
+    """对口型业务逻辑（异步版本）。"""
 
-        video_result = self._api.upload_file(
-            video_path, "lip_sync_video", access_token,
-            on_progress=_on_video_upload,
-        )
+    def __init__(self, api: AsyncApiClient) -> None:
+        self._api = api
 
-        # 上传音频
-        _progress("上传音频", 0, "上传音频中...")
+    async def create(
+        self,
+        video_path: str,
+        audio_path: str,
+        *,
+        model: str = "pro",
+        backway: str = "forward",
+        drive_mode: str = "normal",
+        on_progress: Optional[Callable[[str, int, str], None]] = None,
+    ) -> LipSyncResult:
+        """创建对口型任务并等待完成，参数同 LipSyncService.create。"""
+        sizes = {
+            "video": _file_size(video_path, "视频文件"),
+            "audio": _file_size(audio_path, "音频文件"),
+        }
 
-        def _on_audio_upload(pct: int, msg: str) -> None:
-            _progress("上传音频", pct, msg)
+        def _progress(stage: str, pct: int, msg: str) -> None:
+            if on_progress:
+                on_progress(stage, pct, msg)
 
-        audio_result = self._api.upload_file(
-            audio_path, "lip_sync_audio", access_token,
-            on_progress=_on_audio_upload,
-        )
+        _progress("准备", 0, "检测视频参数...")
+        w, h = await asyncio.to_thread(_video_dimensions, video_path)
+
+        # 视频、音频并发上传
+        _progress("上传文件", 0, "上传视频和音频中...")
+        merger = _UploadProgressMerger(on_progress, sizes)
+        uploads = [
+            asyncio.ensure_future(self._api.upload_file(
+                video_path, "lip_sync_video",
+                on_progress=merger.callback("video"),
+            )),
+            asyncio.ensure_future(self._api.upload_file(
+                audio_path, "lip_sync_audio",
+                on_progress=merger.callback("audio"),
+            )),
+        ]
+        try:
+            video_result, audio_result = await asyncio.gather(*uploads)
+        except BaseException:
+            # gather 不会取消其余任务，任一上传失败时手动取消另一个
+            merger.close()
+            for task in uploads:
+                task.cancel()
+            raise
 
         # 创建任务
         _progress("视频合成", 0, "创建任务...")
-        result = self._api.json_request(
+        result = await self._api.json_request(
             "POST",
-            f"{BASE_URL}/open/v1/video_lip_sync/create",
-            rate_category="lip_sync",
-            silent_rate=True,
-            json={
-                "video_file_id": video_result["file_id"],
-                "audio_type": "audio",
-                "audio_file_id": audio_result["file_id"],
-                "model": model_value,
-                "screen_width": w,
-                "screen_height": h,
-                "backway": backway_value,
-                "drive_mode": drive_mode_value,
-            },
-            headers={"access_token": access_token, "Content-Type": "application/json"},
+            CREATE_ENDPOINT,
+            **_create_request(
+                video_result["file_id"], audio_result["file_id"], w, h, model, backway, drive_mode,
+            ),
         )
         task_id = result.get("data")
         logger.info("对口型任务创建成功，task_id=%s", task_id)
 
         # 轮询结果
-        video_url, duration_ms = self._poll(task_id, access_token, on_progress)
+        video_url, duration_ms = await run_poll_async(self._api, _LipSyncPoller(task_id, on_progress))
 
         _progress("完成", 100, "对口型任务完成")
         return LipSyncResult(video_url=video_url, task_id=task_id, duration_ms=duration_ms)
-
-    def _poll(
-        self,
-        task_id: str,
-        access_token: str,
-        on_progress: Optional[Callable[[str, int, str], None]] = None,
-        max_wait: int = 1800,
-    ) -> tuple[str, int]:
-        """轮询对口型任务状态，返回 (video_url, duration_ms)。"""
-        start = time.time()
-        last_progress = -1
-        last_status = -1
-
-        logger.info("等待视频合成...")
-        while True:
-            if time.time() - start > max_wait:
-                raise TimeoutError(f"对口型任务超时（{max_wait}秒），task_id: {task_id}")
-
-            result = self._api.json_request(
-                "GET",
-                f"{BASE_URL}/open/v1/video_lip_sync/detail",
-                rate_category="default",
-                silent_rate=True,
-                params={"id": task_id},
-                headers={"access_token": access_token},
-            )
-            data = result.get("data", {})
-            status = data.get("status")
-            api_progress = data.get("progress", 0)
-            msg = data.get("msg", "")
-
-            if status != last_status or api_progress != last_progress:
-                status_text = {0: "排队中", 10: "生成中", 20: "成功", 30: "失败"}.get(status, f"未知({status})")
-                logger.info("视频合成: %d%% - %s", api_progress, status_text)
-                if on_progress:
-                    on_progress("视频合成", api_progress, status_text)
-                last_status = status
-                last_progress = api_progress
-
-            if status == 20:
-                video_url = data.get("video_url", "")
-                if not video_url:
-                    raise RuntimeError("视频合成完成但未返回视频URL")
-                duration_ms = data.get("duration", 0)
-                logger.info("视频合成完成！时长: %.1f秒", duration_ms / 1000 if duration_ms else 0)
-                return video_url, duration_ms
-            elif status == 30:
-                check_billing_error(msg)
-                raise RuntimeError(f"视频合成失败: {msg}")
-
-            time.sleep(5)
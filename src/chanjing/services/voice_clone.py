@@ -4,10 +4,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import time
-from typing import Callable, Optional
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional
 
 from ..api import BASE_URL, ApiClient, check_billing_error
 from ..cache import VoiceCloneCache
@@ -17,9 +19,177 @@ from ..utils import (
     get_audio_duration,
     trim_audio,
 )
+from ._polling import TaskPoller, run_poll, run_poll_async
+
+if TYPE_CHECKING:
+    from ..async_api import AsyncApiClient
 
 logger = logging.getLogger("chanjing")
 
+CREATE_ENDPOINT = f"{BASE_URL}/open/v1/create_customised_audio"
+DETAIL_ENDPOINT = f"{BASE_URL}/open/v1/customised_audio"
+
+# 未列出的进行中状态统一显示为“制作中”
+_CLONE_STATUS = {0: "等待制作"}
+
+
+def _prepare_audio(audio_path: str) -> str:
+    """检查参考音频时长，超过 5 分钟时自动裁剪，返回实际上传的文件路径。"""
+    duration = get_audio_duration(audio_path)
+    if duration is None:
+        return audio_path
+
+    logger.info("参考音频时长: %s", format_duration(duration))
+    if duration < 15:
+        raise ValueError(
+            f"参考音频时长过短: {format_duration(duration)}，"
+            f"要求至少 15 秒（当前 {duration:.1f} 秒）"
+        )
+    if duration > 300:
+        logger.info("音频时长超过5分钟，尝试自动裁剪...")
+        trimmed = trim_audio(audio_path, max_duration=299)
+        if not trimmed:
+            raise ValueError(
+                f"参考音频时长超限: {format_duration(duration)} (最长 5:00)，"
+                f"自动裁剪失败，请安装 ffmpeg 或手动裁剪"
+            )
+        logger.info("已自动裁剪到 4:59")
+        return trimmed
+    return audio_path
+
+
+@dataclass
+class _PreparedAudio:
+    source_path: str
+    upload_path: str  # 超长时为裁剪后的临时文件
+    stat: os.stat_result
+    content_hash: Optional[str] = None  # None 表示尚未计算
+
+
+def _prepare_and_hash(
+    audio_path: str,
+    cache: VoiceCloneCache,
+    use_cache: bool,
+    model: str,
+) -> _PreparedAudio:
+    """
+    检查时长（必要时裁剪），并在需要查询缓存时计算内容哈希。
+
+    文件自上次校验后未改动时直接复用记录的哈希，跳过时长检测和整文件读取；
+    不使用缓存时无需哈希；缓存中没有该模型的条目时查询必然未命中，
+    哈希留到上传时边传边算，文件只读一遍。
+    """
+    try:
+        st = os.stat(audio_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"参考音频文件不存在: {audio_path}") from None
+    if use_cache:
+        file_hash = cache.get_file_hash(audio_path, st)
+        if file_hash:
+            return _PreparedAudio(audio_path, audio_path, st, file_hash)
+
+    prepared = _PreparedAudio(audio_path, _prepare_audio(audio_path), st)
+    if use_cache and cache.has_model(model):
+        _record_hash(cache, prepared, file_content_hash(prepared.upload_path))
+    return prepared
+
+
+def _record_hash(cache: VoiceCloneCache, prepared: _PreparedAudio, file_hash: str) -> None:
+    prepared.content_hash = file_hash
+    # 裁剪出的临时文件每次路径不同，只记录未裁剪的原文件
+    if prepared.upload_path == prepared.source_path:
+        cache.put_file_hash(prepared.source_path, prepared.stat, file_hash)
+
+
+def _cached_voice_id(cache: VoiceCloneCache, prepared: _PreparedAudio, model: str) -> Optional[str]:
+    """查询克隆缓存，命中时返回 voice_id（仍需调用方验证是否有效）。"""
+    if not prepared.content_hash:
+        return None
+    cached_id = cache.get(prepared.content_hash, model)
+    if cached_id:
+        logger.info("命中声音克隆缓存，voice_id=%s", cached_id)
+    return cached_id
+
+
+def _uploaded_url(upload_result: dict) -> str:
+    audio_public_url = upload_result["url"]
+    if not audio_public_url:
+        raise RuntimeError("上传接口未返回公网URL，请检查 service 参数")
+    return audio_public_url
+
+
+def _create_request(audio_url: str, model: str) -> dict:
+    """创建克隆任务的 json_request 参数。"""
+    return {
+        "rate_category": "voice_clone",
+        "json": {
+            "name": f"clone_{int(time.time())}",
+            "url": audio_url,
+            "model_type": model,
+        },
+        "auth": True,
+    }
+
+
+def _detail_request(voice_id: str, silent_rate: bool = False) -> dict:
+    """查询克隆声音详情的 json_request 参数。"""
+    return {
+        "rate_category": "voice_clone",
+        "silent_rate": silent_rate,
+        "params": {"id": voice_id},
+        "auth": True,
+    }
+
+
+def _clone_finished(data: dict) -> bool:
+    """克隆完成返回 True，失败/过期/删除时抛出异常，进行中返回 False。"""
+    status = data["status"]
+    if status == 2:
+        return True
+    if status == 4:
+        err_msg = data.get("err_msg", "未知错误")
+        check_billing_error(err_msg)
+        raise RuntimeError(f"声音克隆失败: {err_msg}")
+    if status == 3:
+        raise RuntimeError("声音克隆任务已过期")
+    if status == 99:
+        raise RuntimeError("声音克隆任务已被删除")
+    return False
+
+
+def _status_text(status: int) -> str:
+    return _CLONE_STATUS.get(status, "制作中")
+
+
+class _ClonePoller(TaskPoller):
+    """声音克隆状态：status=2 完成，3/4/99 过期、失败、删除，其余为进行中。"""
+
+    label = "声音克隆"
+    url = DETAIL_ENDPOINT
+
+    def __init__(
+        self,
+        voice_id: str,
+        on_progress: Optional[Callable[[str, int, str], None]],
+        max_wait: int = 600,
+    ) -> None:
+        super().__init__(voice_id, on_progress, max_wait)
+        self.request_kwargs = _detail_request(voice_id, silent_rate=True)
+
+    def timeout_error(self, elapsed: float) -> TimeoutError:
+        return TimeoutError(f"声音克隆超时（{int(elapsed)}秒），voice_id: {self.task_id}")
+
+    def on_state(self, response: dict) -> bool:
+        data = response["data"]
+        if _clone_finished(data):
+            if self.on_progress:
+                self.on_progress(self.label, 100, "声音克隆完成")
+            logger.info("声音克隆完成！")
+            return True
+        status = data["status"]
+        self.report(status, data.get("progress", 0), _status_text(status))
+        return False
+
 
 class VoiceCloneService:
     """声音克隆业务逻辑。"""
@@ -31,7 +201,6 @@ class VoiceCloneService:
     def clone(
         self,
         audio_path: str,
-        access_token: str,
         *,
         model: str = "cicada3.0-turbo",
         use_cache: bool = True,
@@ -42,52 +211,25 @@ class VoiceCloneService:
 
         Args:
             audio_path: 参考音频文件路径（15秒-5分钟）
-            access_token: 平台 access_token
             model: 模型类型 "cicada3.0-turbo" | "cicada3.0" | "cicada1.0"
             use_cache: 是否使用缓存（同音频+同模型跳过重复克隆）
             on_progress: 可选进度回调 (stage, percent, message)
         """
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"参考音频文件不存在: {audio_path}")
-
         def _progress(stage: str, pct: int, msg: str) -> None:
             if on_progress:
                 on_progress(stage, pct, msg)
 
-        # 检查音频时长
-        duration = get_audio_duration(audio_path)
-        if duration is not None:
-            logger.info("参考音频时长: %s", format_duration(duration))
-            if duration < 15:
-                raise ValueError(
-                    f"参考音频时长过短: {format_duration(duration)}，"
-                    f"要求至少 15 秒（当前 {duration:.1f} 秒）"
-                )
-            if duration > 300:
-                logger.info("音频时长超过5分钟，尝试自动裁剪...")
-                trimmed = trim_audio(audio_path, max_duration=299)
-                if trimmed:
-                    audio_path = trimmed
-                    logger.info("已自动裁剪到 4:59")
-                else:
-                    raise ValueError(
-                        f"参考音频时长超限: {format_duration(duration)} (最长 5:00)，"
-                        f"自动裁剪失败，请安装 ffmpeg 或手动裁剪"
-                    )
-
-        audio_hash = file_content_hash(audio_path)
+        # 检查音频时长并计算哈希
+        prepared = _prepare_and_hash(audio_path, self._cache, use_cache, model)
 
         # 缓存检查
-        if use_cache:
-            cached_id = self._cache.get(audio_hash, model)
-            if cached_id:
-                logger.info("命中声音克隆缓存，voice_id=%s", cached_id)
-                if self._validate_voice(cached_id, access_token):
-                    _progress("声音克隆", 100, "缓存命中")
-                    return cached_id
-                else:
-                    logger.info("缓存的声音已失效，重新克隆")
-                    self._cache.remove(audio_hash, model)
+        cached_id = _cached_voice_id(self._cache, prepared, model) if use_cache else None
+        if cached_id:
+            if self._validate_voice(cached_id):
+                _progress("声音克隆", 100, "缓存命中")
+                return cached_id
+            logger.info("缓存的声音已失效，重新克隆")
+            self._cache.remove(prepared.content_hash, model)
 
         # 上传音频
         _progress("上传音频", 0, "上传参考音频...")
@@ -95,113 +237,119 @@ class VoiceCloneService:
         def _on_upload(pct: int, msg: str) -> None:
             _progress("上传音频", pct, msg)
 
+        hash_on_upload = use_cache and prepared.content_hash is None
         upload_result = self._api.upload_file(
-            audio_path, "prompt_audio", access_token,
+            prepared.upload_path, "prompt_audio",
             on_progress=_on_upload,
+            hash_content=hash_on_upload,
         )
-        audio_public_url = upload_result["url"]
-        if not audio_public_url:
-            raise RuntimeError("上传接口未返回公网URL，请检查 service 参数")
+        audio_public_url = _uploaded_url(upload_result)
+        if hash_on_upload:
+            content_hash = upload_result.get("content_hash") or file_content_hash(prepared.upload_path)
+            _record_hash(self._cache, prepared, content_hash)
 
         # 创建克隆任务
         _progress("声音克隆", 0, "创建克隆任务...")
         result = self._api.json_request(
-            "POST",
-            f"{BASE_URL}/open/v1/create_customised_audio",
-            rate_category="voice_clone",
-            json={
-                "name": f"clone_{int(time.time())}",
-                "url": audio_public_url,
-                "model_type": model,
-            },
-            headers={"access_token": access_token, "Content-Type": "application/json"},
+            "POST", CREATE_ENDPOINT, **_create_request(audio_public_url, model),
         )
         voice_id = result["data"]
         logger.info("声音克隆任务创建成功，voice_id=%s", voice_id)
 
         # 轮询克隆结果
-        self._poll_clone(voice_id, access_token, on_progress)
+        run_poll(self._api, _ClonePoller(voice_id, on_progress))
 
         # 写入缓存
-        if use_cache:
-            self._cache.put(audio_hash, model, voice_id)
+        if use_cache and prepared.content_hash:
+            self._cache.put(prepared.content_hash, model, voice_id)
             logger.info("声音克隆结果已缓存")
 
         return voice_id
 
-    def _validate_voice(self, voice_id: str, access_token: str) -> bool:
+    def _validate_voice(self, voice_id: str) -> bool:
         """验证缓存的 voice_id 是否仍然有效。"""
         try:
-            result = self._api.json_request(
-                "GET",
-                f"{BASE_URL}/open/v1/customised_audio",
-                rate_category="voice_clone",
-                params={"id": voice_id},
-                headers={"access_token": access_token},
-            )
+            result = self._api.json_request("GET", DETAIL_ENDPOINT, **_detail_request(voice_id))
             return result["data"]["status"] == 2
         except Exception:
             return False
 
-    def _poll_clone(
+
+class AsyncVoiceCloneService:
+    """声音克隆业务逻辑（异步版本），与同步版本共用 VoiceCloneCache。"""
+
+    def __init__(self, api: AsyncApiClient, cache: VoiceCloneCache) -> None:
+        self._api = api
+        self._cache = cache
+
+    async def clone(
         self,
-        voice_id: str,
-        access_token: str,
+        audio_path: str,
+        *,
+        model: str = "cicada3.0-turbo",
+        use_cache: bool = True,
         on_progress: Optional[Callable[[str, int, str], None]] = None,
-        max_wait: int = 600,
-    ) -> None:
-        """轮询声音克隆状态直到完成。"""
-        start = time.time()
-        last_status = -1
-        last_pct = -1
-        consecutive_errors = 0
-
-        logger.info("等待声音克隆完成...")
-        while True:
-            elapsed = time.time() - start
-            if elapsed > max_wait:
-                raise TimeoutError(f"声音克隆超时（{int(elapsed)}秒），voice_id: {voice_id}")
-
-            try:
-                result = self._api.json_request(
-                    "GET",
-                    f"{BASE_URL}/open/v1/customised_audio",
-                    rate_category="voice_clone",
-                    silent_rate=True,
-                    params={"id": voice_id},
-                    headers={"access_token": access_token},
-                )
-                consecutive_errors = 0
-            except Exception as e:
-                consecutive_errors += 1
-                if consecutive_errors >= 5:
-                    raise RuntimeError(f"声音克隆轮询连续失败5次: {e}") from e
-                time.sleep(5)
-                continue
-
-            data = result["data"]
-            status = data["status"]
-            api_progress = data.get("progress", 0)
-
-            if status == 2:
-                if on_progress:
-                    on_progress("声音克隆", 100, "声音克隆完成")
-                logger.info("声音克隆完成！")
-                return
-            elif status == 4:
-                err_msg = data.get("err_msg", "未知错误")
-                check_billing_error(err_msg)
-                raise RuntimeError(f"声音克隆失败: {err_msg}")
-            elif status == 3:
-                raise RuntimeError("声音克隆任务已过期")
-            elif status == 99:
-                raise RuntimeError("声音克隆任务已被删除")
-            else:
-                if status != last_status or api_progress != last_pct:
-                    status_text = "等待制作" if status == 0 else "制作中"
-                    logger.info("声音克隆: %d%% - %s", api_progress, status_text)
-                    if on_progress:
-                        on_progress("声音克隆", api_progress, status_text)
-                    last_status = status
-                    last_pct = api_progress
-                time.sleep(5)
+    ) -> str:
+        """克隆声音，返回 voice_id，参数同 VoiceCloneService.clone。"""
+        def _progress(stage: str, pct: int, msg: str) -> None:
+            if on_progress:
+                on_progress(stage, pct, msg)
+
+        # 时长检测、裁剪和哈希都是阻塞的文件操作，放到线程池执行
+        prepared = await asyncio.to_thread(
+            _prepare_and_hash, audio_path, self._cache, use_cache, model,
+        )
+
+        # 缓存检查
+        cached_id = _cached_voice_id(self._cache, prepared, model) if use_cache else None
+        if cached_id:
+            if await self._validate_voice(cached_id):
+                _progress("声音克隆", 100, "缓存命中")
+                return cached_id
+            logger.info("缓存的声音已失效，重新克隆")
+            self._cache.remove(prepared.content_hash, model)
+
+        # 上传音频
+        _progress("上传音频", 0, "上传参考音频...")
+
+        def _on_upload(pct: int, msg: str) -> None:
+            _progress("上传音频", pct, msg)
+
+        hash_on_upload = use_cache and prepared.content_hash is None
+        upload_result = await self._api.upload_file(
+            prepared.upload_path, "prompt_audio",
+            on_progress=_on_upload,
+            hash_content=hash_on_upload,
+        )
+        audio_public_url = _uploaded_url(upload_result)
+        if hash_on_upload:
+            content_hash = upload_result.get("content_hash") or await asyncio.to_thread(
+                file_content_hash, prepared.upload_path,
+            )
+            _record_hash(self._cache, prepared, content_hash)
+
+        # 创建克隆任务
+        _progress("声音克隆", 0, "创建克隆任务...")
+        result = await self._api.json_request(
+            "POST", CREATE_ENDPOINT, **_create_request(audio_public_url, model),
+        )
+        voice_id = result["data"]
+        logger.info("声音克隆任务创建成功，voice_id=%s", voice_id)
+
+        # 轮询克隆结果
+        await run_poll_async(self._api, _ClonePoller(voice_id, on_progress))
+
+        # 写入缓存
+        if use_cache and prepared.content_hash:
+            self._cache.put(prepared.content_hash, model, voice_id)
+            logger.info("声音克隆结果已缓存")
+
+        return voice_id
+
+    async def _validate_voice(self, voice_id: str) -> bool:
+        """验证缓存的 voice_id 是否仍然有效。"""
+        try:
+            result = await self._api.json_request("GET", DETAIL_ENDPOINT, **_detail_request(voice_id))
+            return result["data"]["status"] == 2
+        except Exception:
+            return False
@@ -1,45 +1,104 @@
 """
-工具函数：文件哈希、音频时长检测、音频裁剪、格式化等。
+工具函数：JSON 编解码、文件哈希、音频时长检测、音频裁剪、格式化等。
 """
 
 from __future__ import annotations
 
+import functools
 import hashlib
+import json
 import os
+import random
 import shutil
+import struct
 import subprocess
 import tempfile
-from typing import Optional
+from typing import Any, BinaryIO, Callable, Iterator, Optional
 
 try:
-    from mutagen import File as MutagenFile
-    _MUTAGEN_AVAILABLE = True
+    import orjson
+    _ORJSON_AVAILABLE = True
 except ImportError:
-    _MUTAGEN_AVAILABLE = False
+    _ORJSON_AVAILABLE = False
+
+
+def json_loads(data: bytes | str) -> Any:
+    """解析 JSON，安装了 orjson 时使用 orjson。"""
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """序列化为 JSON 字符串（非 ASCII 字符不转义），安装了 orjson 时使用 orjson。"""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
 
-try:
-    import cv2
-    _CV2_AVAILABLE = True
-except ImportError:
-    _CV2_AVAILABLE = False
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON 字节（用作请求体），安装了 orjson 时使用 orjson。"""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+CONTENT_HASH_ALGO = "blake2b-128"
+
+
+def _new_content_hash() -> hashlib.blake2b:
+    return hashlib.blake2b(digest_size=16)
 
 
 def file_content_hash(file_path: str) -> str:
-    """计算文件内容的 MD5 哈希值。"""
-    h = hashlib.md5()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
+    """计算文件内容的 BLAKE2b-128 哈希值（仅用作缓存 key）。"""
+    # 无缓冲读取：数据直接读入哈希缓冲区，不经过 BufferedReader 再拷贝一次
+    with open(file_path, "rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, _new_content_hash).hexdigest()
+        h = _new_content_hash()
+        buf = bytearray(1 << 20)
+        view = memoryview(buf)
+        while n := f.readinto(buf):
+            h.update(view[:n])
     return h.hexdigest()
 
 
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 5.0) -> float:
+    """
+    第 attempt 次（从 0 开始）轮询前的等待秒数：指数退避 + ±20% 随机抖动。
+
+    快速完成的任务能尽早拿到结果，抖动避免大量客户端同时轮询。
+    """
+    return min(cap, base * 2 ** attempt) * (0.8 + 0.4 * random.random())
+
+
+class HashingFileWrapper:
+    """包装已打开的文件对象，读取的同时计算内容哈希（结果与 file_content_hash 一致）。"""
+
+    def __init__(self, fileobj: BinaryIO) -> None:
+        self._file = fileobj
+        self._hash = _new_content_hash()
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._file.read(size)
+        self._hash.update(chunk)
+        self.bytes_read += len(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def format_file_size(size_bytes: float) -> str:
     """格式化文件大小为人类可读字符串。"""
-    for unit in ("B", "KB", "MB", "GB"):
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    # 按二进制位数直接定位单位：每 10 位（1024 倍）进一级
+    idx = min((max(int(size_bytes), 1).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (idx * 10)):.1f} {_SIZE_UNITS[idx]}"
 
 
 def format_duration(seconds: Optional[float]) -> str:
@@ -51,38 +110,161 @@ def format_duration(seconds: Optional[float]) -> str:
     return f"{minutes}:{secs:02d}"
 
 
+def _wav_duration(file_path: str) -> Optional[float]:
+    """解析 WAV（RIFF）文件头计算时长，只读取 fmt 和 data 块头，不加载采样数据。"""
+    with open(file_path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        file_size = os.fstat(f.fileno()).st_size
+        byte_rate = 0
+        pos = 12
+        while pos + 8 <= file_size:
+            f.seek(pos)
+            chunk_id, chunk_size = struct.unpack("<4sI", f.read(8))
+            if chunk_id == b"fmt ":
+                fmt = f.read(16)
+                if len(fmt) < 16:
+                    return None
+                byte_rate = struct.unpack("<HHII", fmt[:12])[3]
+            elif chunk_id == b"data":
+                if not byte_rate:
+                    return None
+                # 流式写入的文件 data 块长度可能未回填，以实际文件长度为上限
+                data_size = min(chunk_size, file_size - pos - 8) if chunk_size else file_size - pos - 8
+                return data_size / byte_rate
+            pos += 8 + chunk_size + (chunk_size & 1)  # 块按偶数字节对齐
+    return None
+
+
+# MPEG Layer III 比特率（kbps），按 [MPEG1, MPEG2/2.5][比特率索引]
+_MP3_BITRATES = (
+    (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+)
+# 采样率，按版本位（0=MPEG2.5, 2=MPEG2, 3=MPEG1）
+_MP3_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+
+
+def _mp3_frame(header: bytes) -> Optional[tuple[int, int, int, int]]:
+    """解析 MP3（MPEG Layer III）帧头，返回 (比特率 bps, 采样率, 每帧采样数, 帧长)；不是有效帧头返回 None。"""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 3
+    layer = (header[1] >> 1) & 3
+    bitrate_idx = header[2] >> 4
+    rate_idx = (header[2] >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[0 if mpeg1 else 1][bitrate_idx] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+    samples = 1152 if mpeg1 else 576
+    frame_len = samples // 8 * bitrate // sample_rate + ((header[2] >> 1) & 1)
+    return bitrate, sample_rate, samples, frame_len
+
+
+def _mp3_duration(file_path: str) -> Optional[float]:
+    """
+    根据首帧估算 MP3 时长：有 Xing/Info 或 VBRI 头时按总帧数精确计算，
+    否则按首帧比特率和音频数据大小估算（CBR 精确，VBR 为近似值）。
+    """
+    with open(file_path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        head = f.read(10)
+        audio_start = 0
+        if head[:3] == b"ID3" and len(head) == 10:
+            # ID3v2 标签长度为 4 字节 syncsafe 整数（每字节低 7 位）
+            tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            audio_start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+        f.seek(audio_start)
+        buf = f.read(64 * 1024)
+
+        pos = buf.find(b"\xff")
+        while 0 <= pos <= len(buf) - 4:
+            frame = _mp3_frame(buf[pos:pos + 4])
+            # 以紧随其后的下一帧帧头确认同步，排除数据中偶然出现的 0xFF
+            if frame and _mp3_frame(buf[pos + frame[3]:pos + frame[3] + 4]):
+                break
+            pos = buf.find(b"\xff", pos + 1)
+        else:
+            return None
+        bitrate, sample_rate, samples, _ = frame
+
+        mpeg1 = buf[pos + 1] & 0x18 == 0x18
+        mono = buf[pos + 3] >> 6 == 3
+        xing_at = pos + 4 + ((17 if mono else 32) if mpeg1 else (9 if mono else 17))
+        xing = buf[xing_at:xing_at + 12]
+        if xing[:4] in (b"Xing", b"Info") and len(xing) == 12 and xing[7] & 1:
+            return struct.unpack(">I", xing[8:12])[0] * samples / sample_rate
+        vbri = buf[pos + 36:pos + 54]
+        if vbri[:4] == b"VBRI" and len(vbri) == 18:
+            return struct.unpack(">I", vbri[14:18])[0] * samples / sample_rate
+
+        f.seek(-128, os.SEEK_END) if file_size >= 128 else f.seek(0)
+        id3v1 = 128 if f.read(3) == b"TAG" else 0
+        return (file_size - audio_start - pos - id3v1) * 8 / bitrate
+
+
+def _sniff_duration_parser(file_path: str) -> Optional[Callable[[str], Optional[float]]]:
+    """
+    按文件头魔数选择时长解析函数，不依赖扩展名：
+    RIFF....WAVE → WAV；ID3 标签或 MPEG 帧同步字 → MP3；其余返回 None。
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(12)
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return _wav_duration
+    if head[:3] == b"ID3" or (len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return _mp3_duration
+    return None
+
+
 def get_audio_duration(file_path: str) -> Optional[float]:
     """
     获取音频文件时长（秒）。
-    优先使用 mutagen，否则回退到 scipy（仅 wav）。
-    """
-    if not os.path.exists(file_path):
-        return None
 
-    if _MUTAGEN_AVAILABLE:
-        try:
-            audio = MutagenFile(file_path)
-            if audio is not None and hasattr(audio.info, "length"):
-                return audio.info.length
-        except Exception:
-            pass
+    WAV / MP3 数据（按文件头识别）直接解析，无需导入 mutagen；
+    其余格式或解析失败时使用 mutagen（可选依赖，按需导入）。
+    """
+    try:
+        parser = _sniff_duration_parser(file_path)
+        duration = parser(file_path) if parser else None
+    except Exception:
+        duration = None
+    if duration:
+        return duration
 
     try:
-        from scipy.io import wavfile
-        sample_rate, data = wavfile.read(file_path)
-        return len(data) / float(sample_rate)
+        from mutagen import File as MutagenFile
+    except ImportError:
+        return None
+    try:
+        audio = MutagenFile(file_path)
+        if audio is not None and hasattr(audio.info, "length"):
+            return audio.info.length
     except Exception:
         pass
-
     return None
 
 
+@functools.lru_cache(maxsize=None)
+def _tool_path(name: str) -> Optional[str]:
+    """
+    查找系统工具（ffmpeg / ffprobe）的可执行文件路径，结果在进程内缓存。
+
+    可通过环境变量 CHANJING_FFMPEG / CHANJING_FFPROBE 指定路径。
+    """
+    return shutil.which(os.environ.get(f"CHANJING_{name.upper()}") or name)
+
+
 def trim_audio(file_path: str, max_duration: int = 299) -> Optional[str]:
     """
     使用系统 ffmpeg 裁剪音频到指定时长。
+    优先直接复制音频流（不重新编码），失败时回退到重新编码。
     返回裁剪后的临时文件路径，失败返回 None。
     """
-    ffmpeg_path = shutil.which("ffmpeg")
+    ffmpeg_path = _tool_path("ffmpeg")
     if not ffmpeg_path:
         return None
 
@@ -90,26 +272,152 @@ def trim_audio(file_path: str, max_duration: int = 299) -> Optional[str]:
     tmp = tempfile.NamedTemporaryFile(delete=False, suffix=ext)
     tmp.close()
 
+    # -t 放在 -i 之前作为输入选项，读到指定时长即停止
+    base_args = [
+        ffmpeg_path, "-nostdin", "-hide_banner", "-loglevel", "error",
+        "-t", str(max_duration), "-i", file_path,
+    ]
+    for codec_args in (["-c", "copy"], []):
+        try:
+            result = subprocess.run(
+                [*base_args, *codec_args, "-y", tmp.name],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=120,
+            )
+        except Exception:
+            break
+        if result.returncode == 0 and os.path.getsize(tmp.name) > 0:
+            return tmp.name
+
+    try:
+        os.remove(tmp.name)
+    except OSError:
+        pass
+    return None
+
+
+def _iter_boxes(f: BinaryIO, start: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+    """遍历 [start, end) 范围内的 MP4 box，产出 (类型, 内容起始偏移, 内容结束偏移)。"""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        header_size = 8
+        if size == 1:  # 64 位长度
+            large = f.read(8)
+            if len(large) < 8:
+                return
+            size = struct.unpack(">Q", large)[0]
+            header_size = 16
+        elif size == 0:  # 延伸到文件末尾
+            size = end - pos
+        if size < header_size:
+            return
+        yield box_type, pos + header_size, min(pos + size, end)
+        pos += size
+
+
+def _mp4_dimensions(video_path: str) -> tuple[Optional[int], Optional[int]]:
+    """
+    解析 MP4/MOV 的 moov/trak/tkhd，返回首个视频轨的显示宽高。
+
+    只按 box 头跳转读取，不读取媒体数据；旋转 90°/270° 的视频交换宽高。
+    """
+    try:
+        with open(video_path, "rb") as f:
+            file_end = f.seek(0, os.SEEK_END)
+            for box_type, moov_start, moov_end in _iter_boxes(f, 0, file_end):
+                if box_type != b"moov":
+                    continue
+                for trak_type, trak_start, trak_end in _iter_boxes(f, moov_start, moov_end):
+                    if trak_type != b"trak":
+                        continue
+                    for tkhd_type, tkhd_start, _ in _iter_boxes(f, trak_start, trak_end):
+                        if tkhd_type != b"tkhd":
+                            continue
+                        f.seek(tkhd_start)
+                        version = f.read(1)
+                        # version(1) + flags(3) + 时间/轨道字段 + reserved(8) + layer/group/volume/reserved(8)
+                        skip = 3 + (32 if version == b"\x01" else 20) + 8 + 8
+                        f.seek(skip, os.SEEK_CUR)
+                        body = f.read(44)
+                        if len(body) < 44:
+                            break
+                        a, b = struct.unpack(">ii", body[0:8])
+                        width = struct.unpack(">I", body[36:40])[0] >> 16
+                        height = struct.unpack(">I", body[40:44])[0] >> 16
+                        if width and height:  # 音频轨宽高为 0
+                            if a == 0 and b != 0:
+                                width, height = height, width
+                            return width, height
+                        break
+                break
+    except (OSError, struct.error):
+        pass
+    return None, None
+
+
+def _ffprobe_dimensions(video_path: str) -> tuple[Optional[int], Optional[int]]:
+    """使用系统 ffprobe 读取首个视频流的显示宽高。"""
+    ffprobe_path = _tool_path("ffprobe")
+    if not ffprobe_path:
+        return None, None
     try:
         result = subprocess.run(
-            [ffmpeg_path, "-i", file_path, "-t", str(max_duration), "-y", tmp.name],
+            [
+                ffprobe_path, "-v", "error", "-select_streams", "v:0",
+                "-show_entries", "stream=width,height:stream_tags=rotate:stream_side_data=rotation",
+                "-of", "json", video_path,
+            ],
             capture_output=True,
-            text=True,
-            timeout=120,
+            timeout=5,
         )
-        if result.returncode == 0 and os.path.exists(tmp.name) and os.path.getsize(tmp.name) > 0:
-            return tmp.name
-        return None
+        if result.returncode != 0:
+            return None, None
+        stream = json_loads(result.stdout)["streams"][0]
+        width, height = int(stream["width"]), int(stream["height"])
+        rotation = stream.get("tags", {}).get("rotate")
+        for side_data in stream.get("side_data_list", []):
+            rotation = side_data.get("rotation", rotation)
+        if rotation is not None and int(float(rotation)) % 180:
+            width, height = height, width
+        return (width, height) if width > 0 and height > 0 else (None, None)
     except Exception:
-        return None
+        return None, None
 
 
 def get_video_dimensions(video_path: str) -> tuple[Optional[int], Optional[int]]:
     """
-    使用 opencv 获取视频宽高。需要安装 opencv-python（可选依赖）。
-    返回 (width, height)，不可用时返回 (None, None)。
+    获取视频显示宽高，返回 (width, height)，不可用时返回 (None, None)。
+
+    依次尝试：直接解析 MP4/MOV 文件头 → 系统 ffprobe → opencv（可选依赖，按需导入）。
+    结果按 (绝对路径, mtime, 文件大小) 缓存，文件未改动时重复调用不再探测。
     """
-    if not _CV2_AVAILABLE:
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return None, None
+    return _probe_dimensions(os.path.abspath(video_path), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=64)
+def _probe_dimensions(video_path: str, mtime_ns: int, size: int) -> tuple[Optional[int], Optional[int]]:
+    """get_video_dimensions 的实际探测逻辑；mtime_ns 和 size 仅用作缓存 key。"""
+    w, h = _mp4_dimensions(video_path)
+    if w and h:
+        return w, h
+    w, h = _ffprobe_dimensions(video_path)
+    if w and h:
+        return w, h
+
+    try:
+        import cv2
+    except ImportError:
         return None, None
     cap = None
     try:
@@ -126,10 +434,10 @@ def get_video_dimensions(video_path: str) -> tuple[Optional[int], Optional[int]]
             cap.release()
 
 
+_KNOWN_EXTENSIONS = frozenset((".mp3", ".wav", ".m4a", ".ogg", ".flac", ".mp4"))
+
+
 def infer_extension_from_url(url: str, default: str = ".mp3") -> str:
     """从 URL 路径推断文件扩展名。"""
-    url_path = url.split("?")[0]
-    for ext in (".mp3", ".wav", ".m4a", ".ogg", ".flac", ".mp4"):
-        if url_path.lower().endswith(ext):
-            return ext
-    return default
+    ext = os.path.splitext(url.split("?", 1)[0])[1].lower()
+    return ext if ext in _KNOWN_EXTENSIONS else default